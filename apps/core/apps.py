@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
+
+    def ready(self):
+        from apps.core.middleware import install_query_counter
+
+        connection_created.connect(
+            install_query_counter, dispatch_uid="apps.core.query_counter"
+        )
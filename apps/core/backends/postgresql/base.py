@@ -0,0 +1,19 @@
+"""
+PostgreSQL backend reporting how long requests wait for their connection:
+opening a new one, or checking one out of the pool with ``DATABASE_POOL``.
+"""
+
+import time
+
+from django.db.backends.postgresql import base
+
+from apps.core.middleware import record_db_connect
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            record_db_connect(time.perf_counter() - start)
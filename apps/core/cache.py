@@ -0,0 +1,26 @@
+from django_redis.cache import RedisCache
+
+from apps.core.middleware import record_cache_lookup
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """
+    django-redis cache backend that reports hits and misses to the metrics of
+    the current request (see RequestIDMiddleware).
+    """
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, _MISSING, version=version, client=client)
+        if value is _MISSING:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1, 0)
+        return value
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        values = super().get_many(keys, *args, **kwargs)
+        record_cache_lookup(len(values), len(keys) - len(values))
+        return values
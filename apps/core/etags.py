@@ -0,0 +1,129 @@
+"""
+Conditional GETs from per-user resource versions.
+
+Every user has a version counter per resource ("accounts", "transactions"...)
+in Redis, bumped after each committed write to it. ``ConditionalGetMixin``
+derives a strong ETag from the versions a view depends on, so an unchanged
+``If-None-Match`` is answered with a 304 before any query or serialization.
+
+A counter that went missing (evicted, expired or flushed) restarts from the
+current time in microseconds, past every value it could have reached, so an
+ETag issued before never comes back for different data.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django_redis import get_redis_connection
+from rest_framework.permissions import SAFE_METHODS
+
+from apps.core.replicas import pin_cache_key, replica_enabled
+
+VERSIONS_KEY_PREFIX = "versions"
+
+
+def versions_key(user_id):
+    return f"{VERSIONS_KEY_PREFIX}:{user_id}"
+
+
+def get_versions(user_id, resources):
+    """
+    Returns the current versions of ``resources`` for a user, in one round
+    trip.
+    """
+    key = versions_key(user_id)
+    start = time.time_ns() // 1000
+    with get_redis_connection("default").pipeline() as pipe:
+        for resource in resources:
+            pipe.hsetnx(key, resource, start)
+        pipe.hmget(key, resources)
+        pipe.expire(key, settings.ETAG_VERSIONS_TTL)
+        *_, versions, _ = pipe.execute()
+    return [int(version) for version in versions]
+
+
+def bump_versions(user_id, resources):
+    """
+    Moves the versions of ``resources`` forward for a user. Call it once the
+    write is committed, see ``bump_versions_on_commit()``.
+    """
+    key = versions_key(user_id)
+    start = time.time_ns() // 1000
+    with get_redis_connection("default").pipeline() as pipe:
+        for resource in resources:
+            pipe.hsetnx(key, resource, start)
+            pipe.hincrby(key, resource, 1)
+        pipe.expire(key, settings.ETAG_VERSIONS_TTL)
+        pipe.execute()
+
+    if replica_enabled():
+        # Background writes pin the user too: a lagging replica would
+        # otherwise serve stale rows under the new versions.
+        cache.set(pin_cache_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def bump_versions_on_commit(user_id, resources):
+    resources = tuple(resources)
+    transaction.on_commit(lambda: bump_versions(user_id, resources))
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    View mixin answering GETs with an ETag built from the versions of
+    ``versioned_resources``, and bumping ``written_resources`` after every
+    successful write.
+    """
+
+    versioned_resources = ()
+    written_resources = ()
+    etag = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD") or not request.user.is_authenticated:
+            return
+
+        self.etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=self.etag)
+        if response is not None:
+            raise NotModified(response)
+
+    def get_etag(self, request):
+        versions = get_versions(request.user.pk, self.versioned_resources)
+        # The representation also depends on the query and the format.
+        variant = (
+            request.user.pk,
+            versions,
+            request.get_full_path(),
+            request.accepted_media_type,
+        )
+        digest = hashlib.sha256(repr(variant).encode()).hexdigest()[:32]
+        return f'"{digest}"'
+
+    def get_written_resources(self):
+        return self.written_resources
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            if self.etag is not None and response.status_code in (200, 304):
+                response["ETag"] = self.etag
+                # Always revalidated, and only by the client that owns it.
+                patch_cache_control(response, private=True, no_cache=True)
+        elif response.status_code < 400 and request.user.is_authenticated:
+            bump_versions_on_commit(request.user.pk, self.get_written_resources())
+        return response
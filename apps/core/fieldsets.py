@@ -0,0 +1,150 @@
+"""
+Sparse fieldsets for API reads.
+
+``?fields=`` lists the fields to return and ``?omit=`` the ones to leave out.
+Nested objects are expanded by default. When ``?expand=`` is given, only the
+objects it lists are expanded and the rest are returned as their ids.
+
+Views using ``SparseFieldsetMixin`` parse these parameters on safe methods.
+Their querysets then load only the columns backing the selected fields, and
+serializers using ``SparseFieldsetSerializerMixin`` render only those fields.
+"""
+
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist
+from djmoney.models.fields import MoneyField
+from djmoney.utils import get_currency_field_name
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+EXPAND_PARAM = "expand"
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    # Selected fields, in the order of the serializer.
+    fields: tuple
+    # Nested fields rendered in full rather than as their ids.
+    expand: frozenset
+
+    def expands(self, name):
+        return name in self.expand and name in self.fields
+
+
+def parse_names(value):
+    names = [name.strip() for name in value.split(",")]
+    return [name for name in names if name]
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin reading the fieldset of safe requests into ``self.fieldset``,
+    None when the full representation is wanted.
+    """
+
+    fieldset = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.fieldset = self.get_fieldset()
+
+    def get_fieldset(self):
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not any(
+            param in params for param in (FIELDS_PARAM, OMIT_PARAM, EXPAND_PARAM)
+        ):
+            return None
+
+        fields = {
+            name: field
+            for name, field in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        }
+        expandable = [
+            name
+            for name, field in fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        ]
+
+        def names(param, choices):
+            selected = parse_names(params.get(param, ""))
+            invalid = set(selected) - set(choices)
+            if invalid:
+                raise ValidationError(
+                    {param: f"Unknown fields: {', '.join(sorted(invalid))}."}
+                )
+            return selected
+
+        selected = set(names(FIELDS_PARAM, fields) or fields)
+        selected -= set(names(OMIT_PARAM, fields))
+        expand = expandable
+        if EXPAND_PARAM in params:
+            expand = names(EXPAND_PARAM, expandable)
+
+        return Fieldset(
+            fields=tuple(name for name in fields if name in selected),
+            expand=frozenset(expand),
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.fieldset
+        return context
+
+    def filter_queryset(self, queryset):
+        return self.defer_unselected(super().filter_queryset(queryset))
+
+    def defer_unselected(self, queryset):
+        """
+        Loads only the model columns the selected fields are read from.
+        """
+        if self.fieldset is None:
+            return queryset
+
+        opts = queryset.model._meta
+        columns = {opts.pk.name}
+        for field in self.get_serializer().fields.values():
+            if field.write_only:
+                continue
+            name = field.source.split(".")[0]
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                # Computed by the model, which may read any column.
+                return queryset
+            if not model_field.concrete or model_field.many_to_many:
+                continue
+            columns.add(name)
+            if isinstance(model_field, MoneyField):
+                columns.add(get_currency_field_name(name, model_field))
+        return queryset.only(*columns)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin keeping only the fields of the view's fieldset, and
+    rendering the nested ones it does not expand as primary keys.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get("fieldset")
+        if fieldset is None:
+            return fields
+
+        for name, field in list(fields.items()):
+            if field.write_only:
+                continue
+            if name not in fieldset.fields:
+                del fields[name]
+            elif isinstance(field, serializers.BaseSerializer) and (
+                not fieldset.expands(name)
+            ):
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    source=field.source, read_only=True
+                )
+        return fields
@@ -0,0 +1,66 @@
+"""
+Measures the imports of a fresh web or Celery process with ``python -X
+importtime``, for the ``profile_imports`` command and the startup tests.
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+# What each kind of process imports before serving its first request or task.
+STARTUP_SCRIPTS = {
+    "web": (
+        "import conf.wsgi\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().reverse_dict\n"
+    ),
+    "celery": "from conf.celery import app\napp.loader.import_default_modules()\n",
+}
+
+
+def measure_startup(target, env=None):
+    """
+    Starts a Python process importing what the ``target`` process does at
+    startup and returns its imports in order, as ``(module, self, cumulative)``
+    tuples with times in microseconds.
+
+    Args:
+        target (str): A key of ``STARTUP_SCRIPTS``
+        env (dict): Environment variables overriding the current ones
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPTS[target]],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", "conf.settings"
+            ),
+            **(env or {}),
+        },
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"The {target} startup failed:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, module = line.removeprefix("import time:").split("|")
+        timings.append((module.strip(), int(own), int(cumulative)))
+    return timings
+
+
+def package_totals(timings):
+    """
+    Adds up the own import time of the modules of each top-level package.
+    """
+    totals = defaultdict(int)
+    for module, own, _cumulative in timings:
+        totals[module.split(".")[0]] += own
+    return dict(totals)
@@ -0,0 +1,184 @@
+"""
+Queue-based logging, so request threads never format or write log files.
+
+With ``LOG_QUEUE`` enabled, the file handlers of ``LOGGING`` are replaced by
+``QueueForwardHandler``s. They run the request filters on the calling thread,
+where the request context lives, and push the record onto one bounded queue
+per process. A single ``LogQueueListener`` thread takes records off the queue
+and hands them to the file handler they were routed to, which does the JSON
+formatting and the I/O.
+
+Each process has its own listener, and several of them rotating the same file
+would race. The file handlers are ``WatchedFileHandler``s instead: they only
+append, and reopen their file once an external tool such as logrotate moved it
+away, see ``conf/logrotate.conf``.
+
+When the queue is full records are dropped (``policy="drop"``) or the caller
+waits up to ``timeout`` seconds for room first (``policy="block"``). Dropped
+records are counted per handler and reported with a warning as soon as the
+queue accepts records again.
+"""
+
+import atexit
+import copy
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+_log_queue = None
+_listener = None
+
+
+def get_log_queue(maxsize=0):
+    """
+    Returns the log queue of this process, created on first use.
+    """
+    global _log_queue
+    if _log_queue is None:
+        _log_queue = queue.Queue(maxsize)
+    return _log_queue
+
+
+def get_log_listener(log_queue, *handlers, respect_handler_level=False):
+    """
+    Listener factory for ``dictConfig``: every forwarding handler shares the
+    listener of the process instead of starting a thread of its own, and adds
+    the handlers it writes with to it.
+    """
+    global _listener
+    if _listener is None:
+        _listener = LogQueueListener(log_queue)
+    _listener.add_targets(*handlers)
+    return _listener
+
+
+def _reset_after_fork():
+    # The parent's listener thread is gone and may have held the queue locks,
+    # whatever is left in the queue is the parent's to write.
+    if _log_queue is not None:
+        _log_queue.__init__(_log_queue.maxsize)
+    if _listener is not None:
+        _listener.reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class LogQueueListener(QueueListener):
+    """
+    Writes queued records with the handler whose name they were routed to.
+    Started lazily by the first record of each process, so gunicorn workers
+    forked from a preloaded master start their own thread.
+
+    Attributes:
+        targets (dict): Handlers writing the records, by name. Handlers are
+            not attached to any logger, this keeps them alive.
+    """
+
+    def __init__(self, log_queue, *handlers):
+        super().__init__(log_queue)
+        self.targets = {}
+        self.add_targets(*handlers)
+        self._pid = None
+
+    def add_targets(self, *handlers):
+        self.targets.update((handler.name, handler) for handler in handlers)
+
+    def ensure_started(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._thread = None
+            self.start()
+            atexit.register(self.stop)
+
+    def reset(self):
+        self._pid = None
+        self._thread = None
+
+    def handle(self, record):
+        handler = self.targets.get(record.log_target)
+        if handler is not None:
+            handler.handle(record)
+
+    def enqueue_sentinel(self):
+        # Wait for room rather than failing to stop when the queue is full.
+        self.queue.put(self._sentinel)
+
+
+class QueueForwardHandler(QueueHandler):
+    """
+    Queues records for the handler named ``target``.
+
+    Attributes:
+        target (str): Name of the ``LOGGING`` handler writing the records
+        policy (str): ``"drop"`` to drop records when the queue is full, or
+            ``"block"`` to wait up to ``timeout`` seconds for room first
+        timeout (float): Longest wait for room with the ``"block"`` policy
+        dropped (int): Records dropped because the queue was full
+    """
+
+    def __init__(self, queue, target, policy="drop", timeout=0.1):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown log queue policy: {policy!r}")
+        super().__init__(queue)
+        self.target = target
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+        self.reported = 0
+
+    def emit(self, record):
+        if self.listener is not None:
+            self.listener.ensure_started()
+        super().emit(record)
+
+    def prepare(self, record):
+        # Only merge the arguments, which may change once the call returns;
+        # formatting, tracebacks included, is left to the listener thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.log_target = self.target
+        return record
+
+    def enqueue(self, record):
+        # handle() holds the handler lock around emit(), so the counters are
+        # only ever updated by one thread at a time.
+        try:
+            self.put(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        if self.dropped > self.reported:
+            self.report_dropped(record)
+
+    def put(self, record):
+        if self.policy == "block":
+            self.queue.put(record, timeout=self.timeout)
+        else:
+            self.queue.put_nowait(record)
+
+    def report_dropped(self, record):
+        count = self.dropped - self.reported
+        report = logging.makeLogRecord(
+            {
+                **record.__dict__,
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": logging.getLevelName(logging.WARNING),
+                "msg": f"Dropped {count} log records, the log queue was full",
+                "args": None,
+                "exc_info": None,
+                "exc_text": None,
+                "stack_info": None,
+            }
+        )
+        report.message = report.msg
+        try:
+            self.queue.put_nowait(report)
+        except queue.Full:
+            return
+        self.reported += count
@@ -0,0 +1,88 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core import signals
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure request latency under concurrent load with connections closed "
+        "after every request and with persistent connections. Each simulated "
+        "request runs one query between the request_started and "
+        "request_finished signals, which is where Django opens and closes "
+        "connections. Run it with DATABASE_POOL=True to measure the pool: the "
+        "pool then serves both modes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per worker"
+        )
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Concurrent workers to simulate"
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=60,
+            help="CONN_MAX_AGE of the persistent mode",
+        )
+
+    def handle(self, *args, **options):
+        modes = {"per request": 0, "persistent": options["max_age"]}
+        if connection.settings_dict["OPTIONS"].get("pool"):
+            modes = {"pooled": 0}
+
+        for name, max_age in modes.items():
+            latencies, opened = self.run(
+                max_age, options["requests"], options["threads"]
+            )
+            self.stdout.write(
+                f"{name:>11}: p50 {statistics.median(latencies) * 1000:6.2f}ms, "
+                f"p95 {self.percentile(latencies, 95) * 1000:6.2f}ms, "
+                f"{opened} connections opened for {len(latencies)} requests"
+            )
+
+    def run(self, max_age, requests, threads):
+        # Every thread's connection is built from this same settings dict.
+        settings_dict = connection.settings_dict
+        previous = settings_dict["CONN_MAX_AGE"]
+        settings_dict["CONN_MAX_AGE"] = max_age
+        connection.close()
+
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        def worker(_):
+            latencies = []
+            try:
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    signals.request_started.send(sender=self.__class__)
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    signals.request_finished.send(sender=self.__class__)
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+            return latencies
+
+        connection_created.connect(count_connection)
+        try:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                results = list(pool.map(worker, range(threads)))
+        finally:
+            connection_created.disconnect(count_connection)
+            settings_dict["CONN_MAX_AGE"] = previous
+
+        latencies = [latency for latencies in results for latency in latencies]
+        return latencies, len(opened)
+
+    def percentile(self, values, percent):
+        return statistics.quantiles(values, n=100)[percent - 1]
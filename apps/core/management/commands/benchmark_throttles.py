@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import SimpleRateThrottle
+
+from apps.core.throttling import AtomicThrottleMixin
+
+BENCH_KEY = "throttle_benchmark"
+
+
+def make_throttle(base, rate):
+    class BenchmarkThrottle(base):
+        def get_rate(self):
+            return rate
+
+        def get_cache_key(self, request, view):
+            return BENCH_KEY
+
+    return BenchmarkThrottle
+
+
+class AtomicThrottle(AtomicThrottleMixin, SimpleRateThrottle):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's SimpleRateThrottle with the atomic Redis throttle on the "
+        "default cache: latency per check, and requests let through when "
+        "concurrent workers share a limit. Point REDIS_URL at a local throwaway "
+        "Redis, the benchmark key is reset between runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--checks", type=int, default=2000, help="Sequential checks to time"
+        )
+        parser.add_argument(
+            "--threads", type=int, default=16, help="Concurrent workers to simulate"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=100, help="Requests allowed per minute"
+        )
+
+    def handle(self, *args, **options):
+        request = APIRequestFactory().get("/", REMOTE_ADDR="127.0.0.1")
+        implementations = {
+            "simple": SimpleRateThrottle,
+            "atomic": AtomicThrottle,
+        }
+
+        for name, base in implementations.items():
+            latency = self.time_checks(base, request, options["checks"])
+            allowed = self.count_allowed(
+                base, request, options["limit"], options["threads"]
+            )
+            self.stdout.write(
+                f"{name:>6}: {latency * 1e6:8.1f}us per check, "
+                f"{allowed} of {options['limit']} allowed under "
+                f"{options['threads']} concurrent workers"
+            )
+
+    def time_checks(self, base, request, checks):
+        cache.delete(BENCH_KEY)
+        throttle_class = make_throttle(base, f"{checks * 10}/day")
+
+        started = time.perf_counter()
+        for _ in range(checks):
+            throttle_class().allow_request(request, None)
+        return (time.perf_counter() - started) / checks
+
+    def count_allowed(self, base, request, limit, threads):
+        cache.delete(BENCH_KEY)
+        throttle_class = make_throttle(base, f"{limit}/minute")
+
+        def check(_):
+            return throttle_class().allow_request(request, None)
+
+        # Offer twice the limit so the limit is the only bound.
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            allowed = sum(pool.map(check, range(limit * 2)))
+        cache.delete(BENCH_KEY)
+        return allowed
@@ -0,0 +1,46 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema once into API_SCHEMA_FILE, which "
+        "/core/schema.json serves in every environment. Needs API_SCHEMA=True; "
+        "run it at build time, before collectstatic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.API_SCHEMA_FILE,
+            help="File to write, API_SCHEMA_FILE by default",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.API_SCHEMA:
+            raise CommandError("Set API_SCHEMA=True to load drf-spectacular.")
+
+        from drf_spectacular.renderers import OpenApiJsonRenderer
+
+        from apps.core.schema import SchemaGenerator
+
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        content = OpenApiJsonRenderer().render(schema, renderer_context={})
+
+        # Replace the file in one step so it is never served half written.
+        output = Path(options["output"])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=output.parent, prefix=f".{output.name}.", delete=False
+        ) as tmp:
+            tmp.write(content)
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, output)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {len(content)} bytes of schema to {output}")
+        )
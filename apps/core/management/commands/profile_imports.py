@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.importtime import STARTUP_SCRIPTS, measure_startup, package_totals
+
+
+class Command(BaseCommand):
+    help = (
+        "Report how long a fresh web or Celery process spends importing each "
+        "module and package before it can serve, measured with python -X "
+        "importtime. Run it with DEBUG=False to see what production loads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=sorted(STARTUP_SCRIPTS),
+            default="web",
+            help="Process to profile",
+        )
+        parser.add_argument(
+            "--top", type=int, default=20, help="Modules and packages to list"
+        )
+        parser.add_argument(
+            "--cumulative",
+            action="store_true",
+            help="Rank modules by cumulative time, their imports included",
+        )
+
+    def handle(self, *args, **options):
+        timings = measure_startup(options["target"])
+        total = sum(own for _, own, _ in timings)
+        self.stdout.write(
+            f"{options['target']} startup: {len(timings)} modules imported "
+            f"in {total / 1000:.1f}ms"
+        )
+
+        column = 2 if options["cumulative"] else 1
+        ranked = sorted(timings, key=lambda timing: timing[column], reverse=True)
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSlowest modules:"))
+        for module, own, cumulative in ranked[: options["top"]]:
+            self.stdout.write(
+                f"{own / 1000:8.1f}ms self {cumulative / 1000:8.1f}ms total  "
+                f"{module}"
+            )
+
+        packages = sorted(
+            package_totals(timings).items(), key=lambda item: item[1], reverse=True
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSlowest packages:"))
+        for package, own in packages[: options["top"]]:
+            self.stdout.write(f"{own / 1000:8.1f}ms  {package}")
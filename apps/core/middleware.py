@@ -1,9 +1,115 @@
 import logging
 import time
 import uuid
-from threading import local
+from contextvars import ContextVar
 
-_thread_locals = local()
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger("apps.core.performance")
+
+
+class RequestMetrics:
+    """
+    Per-request counters of SQL queries, time spent in the database, time
+    spent waiting for database connections and cache hits and misses.
+    """
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.db_connections = 0
+        self.db_connect_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def server_timing(self, response_time):
+        return ", ".join(
+            [
+                f"total;dur={response_time * 1000:.1f}",
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+                f"dbconn;dur={self.db_connect_time * 1000:.1f};"
+                f'desc="{self.db_connections} connections"',
+                f'cache;desc="hits={self.cache_hits} misses={self.cache_misses}"',
+            ]
+        )
+
+
+class RequestContext:
+    """
+    Metadata of the request being served, read by the log filters.
+
+    It lives in a ``ContextVar``, so it follows the request through async
+    views and ``sync_to_async`` threads, and is unset once the response is
+    ready instead of lingering on a reused thread.
+    """
+
+    def __init__(self, request, user):
+        self.request_id = request.id
+        self.client = get_client_ip(request)
+        self.path = request.path
+        self.user_id = (
+            getattr(user, "id", None)
+            if hasattr(user, "is_authenticated") and user.is_authenticated
+            else None
+        )
+        self.start_time = time.time()
+        self.response_time = None
+        self.status_code = 0
+        self.metrics = RequestMetrics()
+
+    @property
+    def elapsed(self):
+        if self.response_time is not None:
+            return self.response_time
+        return time.time() - self.start_time
+
+
+request_context = ContextVar("request_context", default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    """
+    Connection execute wrapper timing every query towards the current request,
+    so queries are counted without DEBUG and without keeping their SQL around.
+    Installed on each new connection by CoreConfig.
+    """
+    current = request_context.get()
+    if current is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        current.metrics.db_time += time.perf_counter() - start
+        current.metrics.db_queries += 1
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def record_db_connect(duration):
+    """
+    Counts a database connection opened, or checked out of the pool, towards
+    the current request, if any.
+    """
+    current = request_context.get()
+    if current is not None:
+        current.metrics.db_connections += 1
+        current.metrics.db_connect_time += duration
+
+
+def record_cache_lookup(hits, misses):
+    """
+    Counts cache hits and misses towards the current request, if any.
+    """
+    current = request_context.get()
+    if current is not None:
+        current.metrics.cache_hits += hits
+        current.metrics.cache_misses += misses
 
 
 def get_client_ip(request):
@@ -17,47 +123,94 @@ def get_client_ip(request):
 
 
 class RequestIDMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        request.id = str(uuid.uuid4())
-        _thread_locals.request_id = request.id
-        _thread_locals.client = get_client_ip(request)
-        _thread_locals.path = request.path
-        _thread_locals.user_id = (
-            getattr(request.user, "id", None)
-            if hasattr(request.user, "is_authenticated")
-            and request.user.is_authenticated
-            else None
-        )
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        current, token = self.start(request, getattr(request, "user", None))
+        try:
+            response = self.get_response(request)
+            return self.finish(request, response, current)
+        finally:
+            request_context.reset(token)
 
-        start_time = time.time()
-        response = self.get_response(request)
-        response_time = time.time() - start_time
+    async def __acall__(self, request):
+        # request.user would load the session user synchronously.
+        user = await request.auser() if hasattr(request, "auser") else None
+        current, token = self.start(request, user)
+        try:
+            response = await self.get_response(request)
+            return self.finish(request, response, current)
+        finally:
+            request_context.reset(token)
 
-        _thread_locals.response_time = response_time
-        _thread_locals.status_code = response.status_code
+    def start(self, request, user):
+        request.id = str(uuid.uuid4())
+        current = RequestContext(request, user)
+        return current, request_context.set(current)
+
+    def finish(self, request, response, current):
+        metrics = current.metrics
+        current.response_time = time.time() - current.start_time
+        current.status_code = response.status_code
         response["X-Request-ID"] = request.id
-        response["X-Response-Time"] = f"{response_time:.3f}s"
+        response["X-Response-Time"] = f"{current.response_time:.3f}s"
+        response["Server-Timing"] = metrics.server_timing(current.response_time)
+
+        if metrics.db_queries > settings.REQUEST_QUERY_BUDGET:
+            logger.warning(
+                "%s %s ran %d queries, over the budget of %d",
+                request.method,
+                request.path,
+                metrics.db_queries,
+                settings.REQUEST_QUERY_BUDGET,
+            )
         return response
 
 
 class TimeLogFilter(logging.Filter):
-    def filter(self, record):
-        response_time = getattr(_thread_locals, "response_time", None)
-        if response_time is None:
-            return False
+    """
+    Only lets through records logged while serving a request.
+    """
 
-        return True
+    def filter(self, record):
+        return request_context.get() is not None
 
 
 class RequestIDFilter(logging.Filter):
     def filter(self, record):
-        record.request_id = getattr(_thread_locals, "request_id", "none")
-        record.client = getattr(_thread_locals, "client", "")
-        record.path = getattr(_thread_locals, "path", "")
-        record.user_id = getattr(_thread_locals, "user_id", "anonymous")
-        record.response_time = getattr(_thread_locals, "response_time", 0)
-        record.status_code = getattr(_thread_locals, "status_code", 0)
+        current = request_context.get()
+        if current is None:
+            record.request_id = "none"
+            record.client = ""
+            record.path = ""
+            record.user_id = "anonymous"
+            record.response_time = 0
+            record.status_code = 0
+            record.db_queries = 0
+            record.db_time = 0
+            record.db_connect_time = 0
+            record.cache_hits = 0
+            record.cache_misses = 0
+            return True
+
+        record.request_id = current.request_id
+        record.client = current.client
+        record.path = current.path
+        record.user_id = current.user_id
+        record.response_time = current.elapsed
+        record.status_code = current.status_code
+        record.db_queries = current.metrics.db_queries
+        record.db_time = current.metrics.db_time
+        record.db_connect_time = current.metrics.db_connect_time
+        record.cache_hits = current.metrics.cache_hits
+        record.cache_misses = current.metrics.cache_misses
         return True
@@ -0,0 +1,95 @@
+"""
+orjson and MessagePack renderers and parsers for the API.
+
+Enabled with ``API_FAST_RENDERERS`` (install the "fast" extra). The JSON
+they write matches DRF's ``JSONRenderer`` byte for byte: types orjson would
+format differently (datetimes, decimals, lazy strings...) go through the
+same ``default`` hook as DRF's encoder. MessagePack carries the same values,
+for clients that send ``Accept: application/msgpack``.
+"""
+
+import codecs
+
+import msgpack
+import orjson
+from moneyed import Money
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+# Format datetimes with the default hook, like DRF does, and accept the
+# non-string keys the json module converts.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    DRF's encoder, also formatting ``Money`` like the serializers do.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, Money):
+            return {"amount": str(obj.amount), "currency": str(obj.currency)}
+        return super().default(obj)
+
+
+default = JSONEncoder().default
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        # orjson can only indent by 2 spaces and has no spaced separators.
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+
+        # Escaped like JSONRenderer does, to keep JSON a JavaScript subset.
+        if b"\xe2\x80" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return content
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=default, datetime=False)
+
+
+class ORJSONParser(parsers.JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = parsers.get_encoding(parser_context or {})
+        try:
+            content = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, LookupError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
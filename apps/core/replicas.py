@@ -0,0 +1,129 @@
+"""
+Optional read replica for the read-heavy list and report endpoints.
+
+With ``REPLICA_DATABASE_URL`` set, settings add a ``replica`` database alias
+and ``ReplicaRouter``. Views using ``ReplicaReadMixin`` read from the replica
+on safe methods; everything else, and every write, uses ``default``.
+
+Replication lags, so ``ReplicaPinMiddleware`` pins users to the primary for
+``REPLICA_PIN_SECONDS`` after any successful write request, and they read
+their own writes back from the database that has them.
+"""
+
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = "replica"
+PIN_CACHE_KEY_PREFIX = "replica_pin"
+
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_enabled():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def pin_cache_key(user_id):
+    return f"{PIN_CACHE_KEY_PREFIX}:{user_id}"
+
+
+def pin_to_primary(user):
+    """
+    Sends the reads of ``user`` to the primary for the next
+    ``REPLICA_PIN_SECONDS``.
+    """
+    cache.set(pin_cache_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return cache.get(pin_cache_key(user.pk)) is not None
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the replica while ``replica_reads`` is set, and all the
+    writes to the primary, even for instances loaded from the replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get():
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    View mixin reading from the replica on safe methods, unless the user is
+    pinned to the primary after a recent write.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication runs here, on the primary, before reads are routed.
+        super().initial(request, *args, **kwargs)
+        if (
+            replica_enabled()
+            and request.method in SAFE_METHODS
+            and not is_pinned_to_primary(request.user)
+        ):
+            replica_reads.set(True)
+
+
+class ReplicaPinMiddleware:
+    """
+    Pins authenticated users to the primary after a successful write request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.pin(request, response)
+        return response
+
+    def pin(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        # DRF sets the user it authenticated on the Django request too.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
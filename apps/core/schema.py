@@ -1,6 +1,19 @@
-from drf_spectacular.utils import OpenApiExample, inline_serializer
+"""
+OpenAPI documentation shared by the apps, and the generator loading it.
+
+Every app documents its views in its own ``schema`` module, decorating them
+from there rather than in ``views.py``: the modules, their examples and
+drf-spectacular's schema machinery are only imported when a schema is
+generated, not by every web and Celery process at startup.
+"""
+
+from django.utils.module_loading import autodiscover_modules
+from drf_spectacular.generators import SchemaGenerator as BaseSchemaGenerator
+from drf_spectacular.utils import OpenApiExample, extend_schema, inline_serializer
 from rest_framework import serializers
 
+from apps.core.views import ping
+
 ErrorResponseSerializer = inline_serializer(
     name="ErrorResponse",
     fields={
@@ -26,3 +39,31 @@ UNAUTHORIZED_EXAMPLES = [
         status_codes=["401"],
     ),
 ]
+
+
+extend_schema(
+    description="Handles a ping request to check if the server is responsive.",
+    responses={
+        200: {
+            "type": "object",
+            "properties": {"ping": {"type": "string"}},
+            "example": {"ping": "pong"},
+        },
+        405: {
+            "type": "object",
+            "properties": {"detail": {"type": "string"}},
+            "example": {"detail": 'Method "POST" not allowed.'},
+        },
+    },
+)(ping)
+
+
+class SchemaGenerator(BaseSchemaGenerator):
+    """
+    Imports the ``schema`` module of every installed app, which documents its
+    views, before generating the schema.
+    """
+
+    def __init__(self, *args, **kwargs):
+        autodiscover_modules("schema")
+        super().__init__(*args, **kwargs)
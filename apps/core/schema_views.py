@@ -0,0 +1,46 @@
+"""
+Views serving the live OpenAPI schema, only mounted with ``API_SCHEMA``.
+
+Kept apart from ``apps.core.schema``: importing drf-spectacular's views loads
+the generator class setting, which points into that module.
+"""
+
+from django.conf import settings
+from django.utils.translation import get_language
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.response import Response
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """
+    SpectacularAPIView generating the schema once per process, API version
+    and language instead of introspecting every view on each request. Code
+    changes restart the process, so a cached schema never outlives the code
+    it describes.
+    """
+
+    _schemas = {}
+
+    def _get_schema_response(self, request):
+        version = (
+            self.api_version or request.version or self._get_version_parameter(request)
+        )
+        key = (
+            settings.SPECTACULAR_SETTINGS.get("VERSION"),
+            version,
+            get_language(),
+            self.urlconf,
+        )
+        if key not in self._schemas:
+            generator = self.generator_class(
+                urlconf=self.urlconf, api_version=version, patterns=self.patterns
+            )
+            self._schemas[key] = generator.get_schema(
+                request=request, public=self.serve_public
+            )
+
+        filename = self._get_filename(request, version)
+        return Response(
+            data=self._schemas[key],
+            headers={"Content-Disposition": f'inline; filename="{filename}"'},
+        )
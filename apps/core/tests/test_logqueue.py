@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from apps.core.logqueue import LogQueueListener, QueueForwardHandler
+from apps.core.middleware import RequestContext, RequestIDFilter, request_context
+
+# Describes the file handlers a process configures from the settings.
+QUEUED_HANDLERS_SCRIPT = """
+import json
+import logging
+
+import django
+
+django.setup()
+
+from apps.core.logqueue import get_log_queue
+
+handlers = {}
+for name in ("file", "security_file", "error_file", "info_file"):
+    handler = logging.getHandlerByName(name)
+    handlers[name] = {
+        "class": type(handler).__name__,
+        "shared_queue": handler.queue is get_log_queue(),
+        "writer": type(handler.listener.targets[handler.target]).__name__,
+        "filters": [type(f).__name__ for f in handler.filters],
+        "level": logging.getLevelName(handler.level),
+        "attached": handler in logging.getLogger("apps").handlers,
+    }
+print(json.dumps(handlers))
+"""
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, name):
+        super().__init__()
+        self.set_name(name)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LogQueueTests(SimpleTestCase):
+    """Test suite for the queue-based file logging"""
+
+    def setUp(self):
+        self.writer = ListHandler("test_queue_writer")
+        self.addCleanup(self.writer.close)
+        self.logger = logging.getLogger("apps.core.tests.logqueue")
+        self.logger.propagate = False
+        self.addCleanup(setattr, self.logger, "propagate", True)
+
+    def add_handler(self, log_queue, **kwargs):
+        handler = QueueForwardHandler(log_queue, "test_queue_writer", **kwargs)
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        return handler
+
+    def test_records_are_written_by_the_listener(self):
+        """Test that queued records reach their handler with the request fields"""
+        log_queue = queue.Queue(100)
+        handler = self.add_handler(log_queue)
+        handler.addFilter(RequestIDFilter())
+        handler.listener = LogQueueListener(log_queue, self.writer)
+        self.addCleanup(handler.listener.stop)
+
+        request = type("Request", (), {"id": "abc", "path": "/ping/", "META": {}})
+        token = request_context.set(RequestContext(request, None))
+        try:
+            self.logger.info("hello %s", "world")
+        finally:
+            request_context.reset(token)
+        handler.listener.stop()
+
+        self.assertEqual(len(self.writer.records), 1)
+        record = self.writer.records[0]
+        self.assertEqual(record.getMessage(), "hello world")
+        self.assertEqual((record.request_id, record.path), ("abc", "/ping/"))
+
+    def test_full_queue_drops_and_reports(self):
+        """Test that records past the queue size are counted and reported"""
+        log_queue = queue.Queue(2)
+        handler = self.add_handler(log_queue)
+
+        for i in range(5):
+            self.logger.warning("record %d", i)
+        self.assertEqual(handler.dropped, 3)
+
+        log_queue.get_nowait()
+        log_queue.get_nowait()
+        self.logger.warning("after")
+
+        self.assertEqual(log_queue.get_nowait().getMessage(), "after")
+        self.assertIn("Dropped 3 log records", log_queue.get_nowait().getMessage())
+        self.assertEqual(handler.reported, 3)
+
+    def test_block_policy_waits_for_room(self):
+        """Test that the block policy drops only after its timeout"""
+        log_queue = queue.Queue(1)
+        handler = self.add_handler(log_queue, policy="block", timeout=0.01)
+
+        self.logger.warning("first")
+        self.logger.warning("second")
+
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(log_queue.get_nowait().getMessage(), "first")
+
+    def test_settings_queue_the_file_handlers(self):
+        """Test that LOG_QUEUE forwards the file handlers to watched files"""
+        result = subprocess.run(
+            [sys.executable, "-c", QUEUED_HANDLERS_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "LOG_QUEUE": "True"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        handlers = json.loads(result.stdout)
+
+        self.assertEqual(
+            sorted(handlers), ["error_file", "file", "info_file", "security_file"]
+        )
+        for name, handler in handlers.items():
+            with self.subTest(handler=name):
+                self.assertEqual(handler["class"], "QueueForwardHandler")
+                self.assertTrue(handler["shared_queue"])
+                self.assertEqual(handler["writer"], "WatchedFileHandler")
+                self.assertTrue(handler["filters"])
+        self.assertTrue(handlers["file"]["attached"])
+        self.assertEqual(handlers["error_file"]["level"], "ERROR")
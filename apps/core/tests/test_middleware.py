@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.middleware import (
+    RequestIDFilter,
+    RequestIDMiddleware,
+    record_db_connect,
+    request_context,
+)
+from apps.users.authentication import local_tokens
+from apps.users.models import CustomUser as User
+
+
+class RequestMetricsTests(APITestCase):
+    """Test suite for the request metrics of RequestIDMiddleware"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse("users:profile")
+        cls.user = User.objects.create_user(
+            email="testuser@example.com", password="testpassword123"
+        )
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+
+    def server_timing(self, response):
+        return dict(
+            metric.strip().split(";", 1)
+            for metric in response["Server-Timing"].split(",")
+        )
+
+    def test_server_timing_header(self):
+        """Test that queries and cache lookups are reported per request"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        timing = self.server_timing(response)
+        self.assertIn("total", timing)
+        self.assertRegex(timing["db"], r'^dur=[\d.]+;desc="\d+ queries"$')
+        self.assertRegex(timing["dbconn"], r'^dur=[\d.]+;desc="\d+ connections"$')
+        self.assertEqual(timing["cache"], 'desc="hits=0 misses=0"')
+
+    def test_cache_lookups_are_counted(self):
+        """Test that token cache misses and hits are counted"""
+        login = self.client.post(
+            reverse("users:knox_login"),
+            {"email": "testuser@example.com", "password": "testpassword123"},
+            format="json",
+        )
+        self.client.cookies.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['token']}")
+
+        response = self.client.get(self.url)
+        self.assertEqual(
+            self.server_timing(response)["cache"], 'desc="hits=0 misses=1"'
+        )
+
+        local_tokens.clear()
+        response = self.client.get(self.url)
+        self.assertEqual(
+            self.server_timing(response)["cache"], 'desc="hits=1 misses=0"'
+        )
+
+    @override_settings(REQUEST_QUERY_BUDGET=0)
+    def test_query_budget(self):
+        """Test that requests over the query budget are logged"""
+        login_url = reverse("users:knox_login")
+        with patch.object(logging.Logger, "warning") as mock_logger:
+            self.client.post(
+                login_url,
+                {"email": "testuser@example.com", "password": "testpassword123"},
+                format="json",
+            )
+
+        budget_warnings = [
+            call for call in mock_logger.call_args_list if "budget" in call.args[0]
+        ]
+        self.assertEqual(len(budget_warnings), 1)
+        self.assertEqual(budget_warnings[0].args[1:3], ("POST", login_url))
+
+
+class RequestContextTests(SimpleTestCase):
+    """Test suite for the contextvars request context"""
+
+    def make_request(self, path):
+        request = RequestFactory().get(path)
+        request.user = AnonymousUser()
+        return request
+
+    def test_sync_request_context_is_reset(self):
+        """Test that the context does not outlive the request"""
+        seen = []
+
+        def view(request):
+            seen.append(request_context.get().request_id)
+            return HttpResponse()
+
+        response = RequestIDMiddleware(view)(self.make_request("/sync/"))
+
+        self.assertEqual(seen, [response["X-Request-ID"]])
+        self.assertIsNone(request_context.get())
+
+    def test_connection_waits_are_counted(self):
+        """Test that database connections opened by the view are reported"""
+
+        def view(request):
+            record_db_connect(0.25)
+            return HttpResponse()
+
+        response = RequestIDMiddleware(view)(self.make_request("/connect/"))
+
+        self.assertIn(
+            'dbconn;dur=250.0;desc="1 connections"', response["Server-Timing"]
+        )
+        record_db_connect(0.25)  # Outside of a request, ignored
+
+    def test_concurrent_async_requests_keep_their_context(self):
+        """Test that interleaved async requests log their own request ids"""
+        records = []
+        log_filter = RequestIDFilter()
+
+        async def view(request):
+            await asyncio.sleep(0.01)
+            record = logging.LogRecord("test", logging.INFO, "", 0, "", (), None)
+            log_filter.filter(record)
+            records.append((request.path, record.request_id, record.path))
+            return HttpResponse()
+
+        middleware = RequestIDMiddleware(view)
+
+        async def serve():
+            requests = [self.make_request(f"/async/{i}/") for i in range(5)]
+            responses = await asyncio.gather(*map(middleware, requests))
+            return requests, responses
+
+        requests, responses = asyncio.run(serve())
+
+        self.assertEqual(len(records), 5)
+        for path, request_id, logged_path in records:
+            self.assertEqual(logged_path, path)
+        self.assertEqual(
+            sorted(request_id for _, request_id, _ in records),
+            sorted(response["X-Request-ID"] for response in responses),
+        )
+        self.assertEqual(
+            {request.path: request.id for request in requests},
+            {path: request_id for path, request_id, _ in records},
+        )
@@ -0,0 +1,128 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+import msgpack
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from djmoney.money import Money
+from rest_framework.exceptions import ParseError
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+from apps.finance.models import InstallmentPlan
+from apps.finance.serializers import InstallmentPlanSerializer
+
+
+class RendererTests(SimpleTestCase):
+    """Test suite for the orjson and MessagePack renderers and parsers"""
+
+    def payload(self):
+        plan = InstallmentPlan(
+            id=7,
+            description="Laptop ☕",
+            total_amount=Decimal("1200.00"),
+            total_installments=12,
+            interest_rate=Decimal("1.50"),
+        )
+        return {
+            "plan": InstallmentPlanSerializer(plan).data,
+            "balance": Decimal("-1500.50"),
+            "date": datetime.date(2023, 1, 31),
+            "created": datetime.datetime(2023, 1, 31, 9, 30, tzinfo=datetime.UTC),
+            "updated": timezone.make_aware(
+                datetime.datetime(2023, 1, 31, 9, 30, 0, 123456),
+                timezone.get_fixed_timezone(-180),
+            ),
+            "time": datetime.time(9, 30, 15, 500),
+            "elapsed": datetime.timedelta(minutes=1, microseconds=5),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "label": gettext_lazy("Expense"),
+            "ids": (i for i in range(3)),
+            1: "non-string key",
+            "text": "line\u2028separator and émoji 🍜",
+            "empty": [None, True, 1.5, {}],
+        }
+
+    def render(self, renderer, media_type=None):
+        return renderer.render(self.payload(), media_type, {})
+
+    def test_orjson_matches_json_renderer(self):
+        """Test that ORJSONRenderer writes the same bytes as JSONRenderer"""
+        expected = self.render(JSONRenderer())
+        self.assertEqual(self.render(ORJSONRenderer()), expected)
+        self.assertIn(b"\\u2028", expected)
+
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            self.render(ORJSONRenderer(), media_type),
+            self.render(JSONRenderer(), media_type),
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_messagepack_carries_the_json_values(self):
+        """Test that MessagePack decodes to what the JSON output does"""
+        content = self.render(MessagePackRenderer())
+        expected = json.loads(self.render(JSONRenderer()))
+        # JSON object keys are always strings.
+        expected[1] = expected.pop("1")
+
+        self.assertEqual(msgpack.unpackb(content, strict_map_key=False), expected)
+
+    def test_money(self):
+        """Test that Money amounts keep their exact decimal and currency"""
+        data = {"amount": Money("10.10", "BRL")}
+        expected = {"amount": {"amount": "10.10", "currency": "BRL"}}
+
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), expected)
+        self.assertEqual(msgpack.unpackb(MessagePackRenderer().render(data)), expected)
+
+    def test_parsers(self):
+        """Test that the parsers read what the renderers write"""
+        content = self.render(JSONRenderer())
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(content)),
+            JSONParser().parse(io.BytesIO(content)),
+        )
+        self.assertEqual(
+            ORJSONParser().parse(
+                io.BytesIO('{"a": "é"}'.encode("latin-1")),
+                parser_context={"encoding": "latin-1"},
+            ),
+            {"a": "é"},
+        )
+        self.assertEqual(
+            MessagePackParser().parse(io.BytesIO(msgpack.packb({"a": [1, "b"]}))),
+            {"a": [1, "b"]},
+        )
+
+        for parser in (ORJSONParser(), MessagePackParser()):
+            with self.subTest(parser=parser), self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(b"\xc1{"))
+
+    def test_accept_header_selects_the_renderer(self):
+        """Test that clients negotiate MessagePack and default to JSON"""
+        renderers = [ORJSONRenderer(), MessagePackRenderer()]
+        for accept, expected in (
+            ("application/msgpack", MessagePackRenderer),
+            ("application/json", ORJSONRenderer),
+            ("*/*", ORJSONRenderer),
+        ):
+            with self.subTest(accept=accept):
+                request = Request(APIRequestFactory().get("/", HTTP_ACCEPT=accept))
+                renderer, _ = DefaultContentNegotiation().select_renderer(
+                    request, renderers
+                )
+                self.assertIsInstance(renderer, expected)
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.replicas import REPLICA_DB_ALIAS, ReplicaRouter, replica_reads
+from apps.finance.models import Account
+from apps.users.models import CustomUser as User
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    """Test suite for the read replica router"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_follow_the_context(self):
+        """Test that only reads flagged for the replica are sent there"""
+        self.assertIsNone(self.router.db_for_read(Account))
+
+        token = replica_reads.set(True)
+        try:
+            self.assertEqual(self.router.db_for_read(Account), REPLICA_DB_ALIAS)
+        finally:
+            replica_reads.reset(token)
+
+    def test_writes_go_to_the_primary(self):
+        """Test that instances read from the replica are saved to the primary"""
+        account = Account()
+        account._state.db = REPLICA_DB_ALIAS
+        self.assertEqual(
+            self.router.db_for_write(Account, instance=account), DEFAULT_DB_ALIAS
+        )
+        self.assertFalse(self.router.allow_migrate(REPLICA_DB_ALIAS, "finance"))
+
+
+class ReplicaReadTests(APITestCase):
+    """Test suite for the replica reads of the list and report endpoints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="testuser@example.com", password="testpassword123"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+        # The test database has no replica: record where reads would go and
+        # keep running them on the primary.
+        self.routed = []
+        route = ReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            self.routed.append(route(router, model, **hints))
+            return None
+
+        patches = [
+            patch("apps.core.replicas.replica_enabled", return_value=True),
+            patch.object(
+                ReplicaRouter, "db_for_read", autospec=True, side_effect=record
+            ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_list_reads_use_the_replica(self):
+        """Test that list and report endpoints read from the replica"""
+        for url in [reverse("account-list"), reverse("monthly-report")]:
+            self.routed.clear()
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn(REPLICA_DB_ALIAS, self.routed)
+        self.assertFalse(replica_reads.get())
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        """Test that users read their own writes from the primary"""
+        response = self.client.post(
+            reverse("account-list"),
+            {"name": "Checking", "type": "CHECKING", "currency": "USD"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.routed.clear()
+        response = self.client.get(reverse("account-list"))
+        self.assertEqual(len(response.data), 1)
+        self.assertNotIn(REPLICA_DB_ALIAS, self.routed)
+
+        cache.clear()
+        self.routed.clear()
+        self.client.get(reverse("account-list"))
+        self.assertIn(REPLICA_DB_ALIAS, self.routed)
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from apps.core.schema import SchemaGenerator
+from apps.core.schema_views import CachedSchemaView
+
+
+class SchemaFileTests(SimpleTestCase):
+    """Test suite for the prebuilt OpenAPI schema"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.schema_dir = tempfile.TemporaryDirectory()
+        cls.schema_file = os.path.join(cls.schema_dir.name, "openapi.json")
+        call_command("build_schema", output=cls.schema_file, stdout=StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.schema_dir.cleanup()
+        super().tearDownClass()
+
+    def test_serves_the_built_schema(self):
+        """Test that the schema file is served with an ETag and cache headers"""
+        with override_settings(API_SCHEMA_FILE=self.schema_file):
+            response = self.client.get(reverse("schema-file"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/vnd.oai.openapi+json")
+        self.assertIn("/finance/sync/", response.json()["paths"])
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+
+        with override_settings(API_SCHEMA_FILE=self.schema_file):
+            response = self.client.get(
+                reverse("schema-file"), HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_redirects_to_the_collected_schema(self):
+        """Test that a collected schema is served under its hashed name"""
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        manifest_storage = {
+            "BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+        }
+        with override_settings(
+            API_SCHEMA_FILE=self.schema_file,
+            STATICFILES_DIRS=[self.schema_dir.name],
+            STATIC_ROOT=static_root.name,
+            STORAGES={**settings.STORAGES, "staticfiles": manifest_storage},
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            client = Client()
+            response = client.get(reverse("schema-file"))
+            self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+            self.assertRegex(response["Location"], r"/openapi\.[0-9a-f]{12}\.json$")
+            self.assertIn("no-cache", response["Cache-Control"])
+
+            response = client.get(response["Location"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertIn(
+                "/finance/sync/",
+                json.loads(b"".join(response.streaming_content))["paths"],
+            )
+
+    def test_missing_schema(self):
+        """Test that a missing build is reported as not found"""
+        missing = os.path.join(self.schema_dir.name, "missing.json")
+        with override_settings(API_SCHEMA_FILE=missing):
+            response = self.client.get(reverse("schema-file"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_live_schema_is_generated_once(self):
+        """Test that the live schema view reuses the schema it generated"""
+        CachedSchemaView._schemas.clear()
+        self.addCleanup(CachedSchemaView._schemas.clear)
+
+        with patch.object(
+            SchemaGenerator, "get_schema", autospec=True, return_value={}
+        ) as get_schema:
+            for _ in range(2):
+                response = self.client.get(reverse("schema"))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_schema.call_count, 1)
@@ -0,0 +1,54 @@
+import os
+
+from django.test import SimpleTestCase
+
+from apps.core.importtime import STARTUP_SCRIPTS, measure_startup
+from apps.core.schema import SchemaGenerator
+
+# Settings a production process starts with, on top of the test environment.
+PRODUCTION_ENV = {
+    "DEBUG": "False",
+    "API_SCHEMA": "False",
+    "DJANGO_SETTINGS_MODULE": "conf.settings",
+    "SENTRY_DSN": "",
+    "ALLOWED_HOSTS": os.environ.get("ALLOWED_HOSTS", "localhost"),
+    "CORS_ALLOWED_ORIGINS": os.environ.get("CORS_ALLOWED_ORIGINS", "http://localhost"),
+}
+
+# Modules only needed to generate the API schema or while developing.
+DEVELOPMENT_MODULES = ("drf_spectacular", "debug_toolbar", "django_extensions")
+
+# Own import time of all modules, generous enough for slow CI machines.
+STARTUP_BUDGET_MS = int(os.environ.get("STARTUP_BUDGET_MS", 3000))
+
+
+class StartupTests(SimpleTestCase):
+    """Test suite for what web and Celery processes import at startup"""
+
+    def test_production_startup_imports(self):
+        """Test that startup skips schema and development modules"""
+        for target in STARTUP_SCRIPTS:
+            with self.subTest(target=target):
+                timings = measure_startup(target, env=PRODUCTION_ENV)
+                modules = [module for module, _own, _cumulative in timings]
+
+                self.assertIn("apps.finance.views", modules)
+                self.assertEqual(
+                    [
+                        module
+                        for module in modules
+                        if module.split(".")[0] in DEVELOPMENT_MODULES
+                        or module.endswith(".schema")
+                        and module.startswith("apps.")
+                    ],
+                    [],
+                )
+                total = sum(own for _module, own, _cumulative in timings)
+                self.assertLess(total / 1000, STARTUP_BUDGET_MS)
+
+    def test_schema_generator_loads_the_app_schemas(self):
+        """Test that the documentation in the schema modules is applied"""
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        self.assertIn("Cursor returned by the last sync.", str(schema["paths"]))
+        self.assertIn("knoxApiToken", schema["components"]["securitySchemes"])
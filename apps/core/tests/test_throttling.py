@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import SimpleRateThrottle
+
+from apps.core.throttling import AtomicThrottleMixin
+
+TEST_KEY = "throttle_atomic_test_key"
+
+
+class ThreeAMinuteThrottle(AtomicThrottleMixin, SimpleRateThrottle):
+    rate = "3/minute"
+
+    def get_cache_key(self, request, view):
+        return TEST_KEY
+
+
+class AtomicThrottleTests(SimpleTestCase):
+    """Test suite for the atomic Redis rate throttle"""
+
+    def setUp(self):
+        cache.delete(TEST_KEY)
+        self.addCleanup(cache.delete, TEST_KEY)
+        self.request = APIRequestFactory().get("/")
+
+    def test_limits_requests(self):
+        """Test that requests past the rate are refused with a wait time"""
+        for _ in range(3):
+            self.assertTrue(ThreeAMinuteThrottle().allow_request(self.request, None))
+
+        throttle = ThreeAMinuteThrottle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertGreater(throttle.wait(), 55)
+        self.assertLessEqual(throttle.wait(), 60)
+
+    def test_replaces_legacy_history(self):
+        """Test that a history left by SimpleRateThrottle does not break checks"""
+        cache.set(TEST_KEY, [1.0, 2.0], 60)
+        self.assertTrue(ThreeAMinuteThrottle().allow_request(self.request, None))
+
+    def test_concurrent_checks_respect_the_limit(self):
+        """Test that concurrent workers cannot exceed the rate together"""
+
+        def check(_):
+            return ThreeAMinuteThrottle().allow_request(self.request, None)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            allowed = sum(pool.map(check, range(24)))
+        self.assertEqual(allowed, 3)
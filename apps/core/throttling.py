@@ -0,0 +1,95 @@
+"""
+Rate throttles backed by a single atomic Redis script per check.
+
+DRF's ``SimpleRateThrottle`` reads the request history from the cache, trims
+it in Python and writes it back: two round trips, and concurrent workers can
+overwrite each other's history and let extra requests through. The throttles
+here keep the history in a sorted set and trim, count and record it inside one
+Lua script, timed with the Redis clock so workers do not need synced clocks.
+"""
+
+import os
+
+from django_redis import get_redis_connection
+from rest_framework import throttling
+
+# KEYS[1]: history key. ARGV: window (ms), allowed requests, unique member.
+# Returns {allowed, milliseconds until the next request would be allowed}.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local kind = redis.call('TYPE', key).ok
+if kind ~= 'zset' and kind ~= 'none' then
+    redis.call('DEL', key)
+end
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+    return {1, 0}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+_scripts = {}
+
+
+def get_script(alias="default"):
+    """
+    Returns the sliding window script registered on the Redis connection of
+    the ``alias`` cache. It runs with EVALSHA, falling back to EVAL once.
+    """
+    if alias not in _scripts:
+        _scripts[alias] = get_redis_connection(alias).register_script(
+            SLIDING_WINDOW_SCRIPT
+        )
+    return _scripts[alias]
+
+
+class AtomicThrottleMixin:
+    """
+    Replaces the history handling of a ``SimpleRateThrottle`` subclass with
+    the atomic sliding window script. Cache keys, scopes and rates are the
+    ones of the throttle it is mixed into.
+
+    Attributes:
+        cache_alias (str): The cache whose Redis connection holds the history
+    """
+
+    cache_alias = "default"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        # make_key() puts the history where the cache API finds it too.
+        allowed, wait = get_script(self.cache_alias)(
+            keys=[self.cache.make_key(self.key)],
+            args=[self.duration * 1000, self.num_requests, os.urandom(8).hex()],
+        )
+        self.wait_ms = wait
+        if allowed:
+            return True
+        return self.throttle_failure()
+
+    def wait(self):
+        return self.wait_ms / 1000
+
+
+class AnonRateThrottle(AtomicThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(AtomicThrottleMixin, throttling.UserRateThrottle):
+    pass
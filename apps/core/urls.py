@@ -6,4 +6,5 @@ appname = "core"
 
 urlpatterns = [
     path("ping/", views.ping, name="ping"),
+    path("schema.json", views.schema_file, name="schema-file"),
 ]
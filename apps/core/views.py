@@ -1,33 +1,89 @@
+import hashlib
 import logging
+import os
+from functools import lru_cache
+from pathlib import Path
 
-from django.http import JsonResponse
-from drf_spectacular.utils import extend_schema
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
 from rest_framework.decorators import api_view, throttle_classes
-from rest_framework.throttling import AnonRateThrottle
+
+from apps.core.throttling import AnonRateThrottle
 
 
 class PingRateThrottle(AnonRateThrottle):
     rate = "10/minute"
 
 
-@extend_schema(
-    description="Handles a ping request to check if the server is responsive.",
-    responses={
-        200: {
-            "type": "object",
-            "properties": {"ping": {"type": "string"}},
-            "example": {"ping": "pong"},
-        },
-        405: {
-            "type": "object",
-            "properties": {"detail": {"type": "string"}},
-            "example": {"detail": 'Method "POST" not allowed.'},
-        },
-    },
-)
 @api_view(["GET"])
 @throttle_classes([PingRateThrottle])
 def ping(request):
     logger = logging.getLogger("django.info")
     logger.info("Ping request received")
     return JsonResponse({"ping": "pong"})
+
+
+@lru_cache(maxsize=1)
+def load_schema_file(path, mtime):
+    """
+    Reads the prebuilt schema and its ETag once per build of the file.
+    """
+    with open(path, "rb") as schema:
+        content = schema.read()
+    return content, f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def schema_static_url():
+    """
+    Returns the URL of the content-hashed copy of the schema file published
+    by collectstatic, or None when it was not collected.
+    """
+    path = Path(settings.API_SCHEMA_FILE)
+    for directory in settings.STATICFILES_DIRS:
+        if path.is_relative_to(directory):
+            name = path.relative_to(directory).as_posix()
+            break
+    else:
+        return None
+
+    try:
+        url = staticfiles_storage.url(name)
+    except ValueError:
+        # Not in the manifest.
+        return None
+    return url if url != staticfiles_storage.base_url + name else None
+
+
+@require_safe
+def schema_file(request):
+    """
+    Serves the OpenAPI schema prebuilt by `manage.py build_schema`, so
+    clients never trigger a live introspection of the views.
+
+    Once collectstatic published its content-hashed copy, which whitenoise
+    serves as immutable, this redirects there and only the redirect is
+    revalidated. The file itself is served otherwise.
+    """
+    static_url = schema_static_url()
+    if static_url is not None:
+        response = HttpResponseRedirect(static_url)
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    path = settings.API_SCHEMA_FILE
+    try:
+        content, etag = load_schema_file(path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return JsonResponse(
+            {"detail": "The API schema has not been built."}, status=404
+        )
+
+    response = get_conditional_response(request, etag=etag) or HttpResponse(
+        content, content_type="application/vnd.oai.openapi+json"
+    )
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=settings.API_SCHEMA_MAX_AGE)
+    return response
@@ -1,13 +1,31 @@
 from django.contrib import admin
 
-from apps.finance.models import Account, Category, InstallmentPlan, Tag, Transaction
+from apps.finance.models import (
+    Account,
+    AccountBalance,
+    Category,
+    ImportJob,
+    InstallmentPlan,
+    Tag,
+    Transaction,
+)
+
+
+class AccountBalanceInline(admin.TabularInline):
+    model = AccountBalance
+    fields = ("currency", "amount", "updated_at")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
 
 
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
-    list_display = ("name", "user", "type", "currency", "closing_day")
+    list_display = ("name", "user", "type", "currency", "closing_day", "balance")
     list_filter = ("type", "currency", "user")
     search_fields = ("name", "user__email")
+    readonly_fields = ("balance",)
+    inlines = [AccountBalanceInline]
 
 
 @admin.register(Category)
@@ -49,3 +67,19 @@ class InstallmentPlanAdmin(admin.ModelAdmin):
         "interest_rate",
     )
     search_fields = ("description",)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "file",
+        "user",
+        "file_format",
+        "status",
+        "processed_rows",
+        "created_count",
+        "error_count",
+        "created_at",
+    )
+    list_filter = ("status", "file_format")
+    search_fields = ("file", "user__email")
@@ -0,0 +1,71 @@
+import csv
+import json
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef
+
+from apps.finance.models import Transaction
+
+EXPORT_FIELDS = (
+    "id",
+    "type",
+    "description",
+    "amount",
+    "amount_currency",
+    "transaction_date",
+    "payment_date",
+    "account_id",
+    "category_id",
+    "tag_ids",
+    "installment_plan_id",
+    "installment_number",
+    "transfer_partner_id",
+)
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    A file-like object whose write() hands the value back, so csv.writer can
+    format one row at a time for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """
+    Yields the transactions of ``queryset`` as plain dicts, read through a
+    server-side cursor so memory stays flat regardless of the row count.
+    """
+    TransactionTag = Transaction.tags.through
+    tag_ids = TransactionTag.objects.filter(transaction_id=OuterRef("pk")).values(
+        "tag_id"
+    )
+
+    return (
+        queryset.annotate(tag_ids=ArraySubquery(tag_ids))
+        .values(*EXPORT_FIELDS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row["tag_ids"] = " ".join(str(tag_id) for tag_id in row["tag_ids"])
+        yield writer.writerow(row[field] for field in EXPORT_FIELDS)
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", stream_csv),
+    "ndjson": ("application/x-ndjson", stream_ndjson),
+}
@@ -1,6 +1,6 @@
 import django_filters
 
-from apps.finance.models import Transaction
+from apps.finance.models import MonthlyRollup, Transaction
 
 
 class TransactionFilter(django_filters.FilterSet):
@@ -13,3 +13,18 @@ class TransactionFilter(django_filters.FilterSet):
     class Meta:
         model = Transaction
         fields = ["account", "category", "tags", "type", "start_date", "end_date"]
+
+
+class MonthlyRollupFilter(django_filters.FilterSet):
+    start_month = django_filters.DateFilter(
+        field_name="month", lookup_expr="gte", input_formats=["%Y-%m", "%Y-%m-%d"]
+    )
+    end_month = django_filters.DateFilter(
+        field_name="month", lookup_expr="lte", input_formats=["%Y-%m", "%Y-%m-%d"]
+    )
+    account = django_filters.NumberFilter(field_name="account_id")
+    category = django_filters.NumberFilter(field_name="category_id")
+
+    class Meta:
+        model = MonthlyRollup
+        fields = ["account", "category", "type", "currency", "start_month", "end_month"]
@@ -0,0 +1,251 @@
+import csv
+import datetime
+import io
+import re
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from operator import attrgetter
+
+from django.db import transaction
+from moneyed import CurrencyDoesNotExist, get_currency
+
+from apps.core.etags import bump_versions_on_commit
+from apps.finance.models import Category, ImportJob, Tag, Transaction
+from apps.finance.services import calculate_payment_dates
+
+IMPORT_BATCH_SIZE = 1000
+
+# Transaction.amount is a MoneyField(max_digits=14, decimal_places=2).
+AMOUNT_PLACES = Decimal("0.01")
+MAX_AMOUNT = Decimal(10) ** 12
+
+OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)")
+
+
+class RowError(Exception):
+    pass
+
+
+def parse_csv(stream):
+    """
+    Yields rows of a CSV statement with the columns ``date``, ``description``,
+    ``amount`` and the optional ``type``, ``currency``, ``account``,
+    ``category`` and ``tags`` (separated by ``|``).
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig"))
+    for line, record in enumerate(reader, start=2):
+        record = {
+            (key or "").strip().lower(): (value or "").strip()
+            for key, value in record.items()
+        }
+        yield {
+            "line": line,
+            "date": record.get("date", ""),
+            "description": record.get("description", ""),
+            "amount": record.get("amount", ""),
+            "type": record.get("type", "").lower(),
+            "currency": record.get("currency", "").upper(),
+            "account": record.get("account", ""),
+            "category": record.get("category", ""),
+            "tags": [tag.strip() for tag in record.get("tags", "").split("|")],
+        }
+
+
+def parse_ofx(stream):
+    """
+    Yields the ``STMTTRN`` entries of an OFX statement (SGML or XML flavour),
+    reading the file line by line.
+    """
+    number = 0
+    current = None
+    for raw in io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace"):
+        for closing, tag, value in OFX_TAG.findall(raw):
+            if tag == "STMTTRN":
+                if not closing:
+                    number += 1
+                    current = {}
+                elif current is not None:
+                    yield _ofx_row(number, current)
+                    current = None
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+def _ofx_row(number, fields):
+    posted = fields.get("DTPOSTED", "")[:8]
+    if len(posted) == 8 and posted.isdigit():
+        posted = f"{posted[:4]}-{posted[4:6]}-{posted[6:]}"
+
+    return {
+        "line": number,
+        "date": posted,
+        "description": fields.get("NAME") or fields.get("MEMO", ""),
+        "amount": fields.get("TRNAMT", ""),
+        "type": "",
+        "currency": fields.get("CURRENCY", ""),
+        "account": "",
+        "category": "",
+        "tags": [],
+    }
+
+
+PARSERS = {
+    ImportJob.FileFormat.CSV: parse_csv,
+    ImportJob.FileFormat.OFX: parse_ofx,
+}
+
+
+class TransactionImporter:
+    """
+    Writes the rows of an ``ImportJob`` in ``bulk_create`` batches.
+
+    Accounts, categories and tags are resolved through lookup dicts built once
+    per job. Every batch is committed together with the job progress, so a
+    retried task resumes after the last committed row instead of importing it
+    twice.
+    """
+
+    def __init__(self, job, batch_size=IMPORT_BATCH_SIZE):
+        self.job = job
+        self.batch_size = batch_size
+        self.accounts = {a.name.lower(): a for a in job.user.accounts.all()}
+        self.categories = {c.name.lower(): c for c in job.user.categories.all()}
+        self.tags = {t.name.lower(): t for t in job.user.tags.all()}
+
+    def run(self):
+        job = self.job
+        job.status = ImportJob.Status.PROCESSING
+        job.save(update_fields=["status", "updated_at"])
+
+        with job.file.open("rb") as stream:
+            rows = PARSERS[job.file_format](stream)
+            rows = islice(rows, job.processed_rows, None)
+            while batch := list(islice(rows, self.batch_size)):
+                self.import_batch(batch)
+
+        job.status = ImportJob.Status.COMPLETED
+        job.save(update_fields=["status", "updated_at"])
+        return job
+
+    @transaction.atomic
+    def import_batch(self, batch):
+        job = self.job
+        transactions = []
+        tag_links = []
+        for row in batch:
+            try:
+                txn, tags = self.build_transaction(row)
+            except RowError as e:
+                job.error_count += 1
+                if len(job.errors) < ImportJob.MAX_ERRORS:
+                    job.errors.append({"line": row["line"], "error": str(e)})
+                continue
+
+            transactions.append(txn)
+            tag_links.append(tags)
+
+        self.set_payment_dates(transactions)
+        transactions = Transaction.objects.bulk_create(transactions)
+        Transaction.post_created(transactions)
+
+        TransactionTag = Transaction.tags.through
+        TransactionTag.objects.bulk_create(
+            TransactionTag(transaction_id=txn.pk, tag_id=tag.pk)
+            for txn, tags in zip(transactions, tag_links)
+            for tag in tags
+        )
+
+        if transactions:
+            bump_versions_on_commit(job.user_id, ("transactions", "accounts"))
+
+        job.processed_rows += len(batch)
+        job.created_count += len(transactions)
+        job.save(
+            update_fields=[
+                "processed_rows",
+                "created_count",
+                "error_count",
+                "errors",
+                "updated_at",
+            ]
+        )
+
+    def set_payment_dates(self, transactions):
+        per_account = defaultdict(list)
+        for txn in transactions:
+            per_account[txn.account].append(txn)
+
+        for account, txns in per_account.items():
+            dates = map(attrgetter("transaction_date"), txns)
+            for txn, payment_date in zip(txns, calculate_payment_dates(dates, account)):
+                txn.payment_date = payment_date
+
+    def build_transaction(self, row):
+        account = self.resolve_account(row["account"])
+
+        try:
+            transaction_date = datetime.date.fromisoformat(row["date"])
+        except ValueError:
+            raise RowError(f"Invalid date: {row['date']!r}.")
+
+        try:
+            amount = Decimal(row["amount"].replace(",", "")).quantize(AMOUNT_PLACES)
+        except InvalidOperation:
+            raise RowError(f"Invalid amount: {row['amount']!r}.")
+        if not amount.is_finite() or abs(amount) >= MAX_AMOUNT:
+            raise RowError(f"Invalid amount: {row['amount']!r}.")
+
+        if row["type"]:
+            if row["type"] not in Transaction.TransactionType.values:
+                raise RowError(f"Invalid type: {row['type']!r}.")
+            transaction_type = row["type"]
+        elif amount < 0:
+            transaction_type = Transaction.TransactionType.EXPENSE
+        else:
+            transaction_type = Transaction.TransactionType.INCOME
+
+        if not row["description"]:
+            raise RowError("Description is required.")
+
+        currency = row["currency"].upper() or str(account.currency)
+        try:
+            get_currency(currency)
+        except CurrencyDoesNotExist:
+            raise RowError(f"Invalid currency: {row['currency']!r}.")
+
+        txn = Transaction(
+            account=account,
+            user_id=account.user_id,
+            category=self.resolve(Category, self.categories, row["category"]),
+            description=row["description"][:255],
+            amount=abs(amount),
+            amount_currency=currency,
+            type=transaction_type,
+            transaction_date=transaction_date,
+        )
+        tags = {self.resolve(Tag, self.tags, name) for name in row["tags"] if name}
+        return txn, tags
+
+    def resolve_account(self, name):
+        if not name:
+            if self.job.account is None:
+                raise RowError("Account is required.")
+            return self.job.account
+
+        try:
+            return self.accounts[name.lower()]
+        except KeyError:
+            raise RowError(f"Unknown account: {name!r}.")
+
+    def resolve(self, model, lookup, name):
+        """
+        Returns the category or tag called ``name``, creating it on first use.
+        """
+        if not name:
+            return None
+
+        key = name.lower()
+        if key not in lookup:
+            lookup[key], _ = model.objects.get_or_create(user=self.job.user, name=name)
+        return lookup[key]
@@ -0,0 +1,120 @@
+"""
+Read-optimized transaction listing.
+
+``TransactionSerializer`` builds a model instance, a ``Money`` and a DRF field
+call per column for every row, and queries the tags of each row separately.
+The list view reads plain tuples instead, with the tag ids aggregated in SQL
+and the installment plan joined, and turns them into the very same structure
+of JSON-ready values. With a sparse fieldset, only the columns, aggregates
+and joins of the selected fields are read.
+"""
+
+from operator import attrgetter
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef
+
+from apps.finance.models import Transaction
+
+INSTALLMENT_PLAN_COLUMNS = (
+    "installment_plan_id",
+    "installment_plan__description",
+    "installment_plan__total_amount",
+    "installment_plan__total_installments",
+    "installment_plan__interest_rate",
+)
+# Read by TransactionCursorPagination to encode the cursors.
+KEYSET_COLUMNS = ("id", "payment_date", "transaction_date")
+
+
+def format_date(value):
+    return value.isoformat() if value else None
+
+
+def format_installment_plan(row):
+    if row.installment_plan_id is None:
+        return None
+    return {
+        "id": row.installment_plan_id,
+        "description": row.installment_plan__description,
+        "total_amount": str(row.installment_plan__total_amount),
+        "total_installments": row.installment_plan__total_installments,
+        "interest_rate": str(row.installment_plan__interest_rate),
+    }
+
+
+def column(name, formatter=None):
+    if formatter is None:
+        return (name,), attrgetter(name)
+    getter = attrgetter(name)
+    return (name,), lambda row: formatter(getter(row))
+
+
+# The fields of TransactionSerializer, in its order: the columns each one is
+# read from and the function formatting it out of a row.
+LIST_FIELDS = {
+    "id": column("id"),
+    "type": column("type"),
+    "description": column("description"),
+    "amount": column("amount", str),
+    "amount_currency": column("amount_currency"),
+    "transaction_date": column("transaction_date", format_date),
+    "payment_date": column("payment_date", format_date),
+    "account": column("account_id"),
+    "category": column("category_id"),
+    "tags": column("tag_ids"),
+    "installment_number": column("installment_number"),
+    "transfer_partner": column("transfer_partner_id"),
+    "installment_plan": (INSTALLMENT_PLAN_COLUMNS, format_installment_plan),
+}
+# Nested fields rendered as their ids when not expanded.
+COLLAPSED_FIELDS = {
+    "installment_plan": column("installment_plan_id"),
+}
+
+
+def list_fields(fieldset=None):
+    """
+    Returns the ``(name, columns, formatter)`` of the fields to list, all of
+    them unless a ``Fieldset`` selects some.
+    """
+    if fieldset is None:
+        return [(name, *LIST_FIELDS[name]) for name in LIST_FIELDS]
+
+    fields = []
+    for name in fieldset.fields:
+        if name in COLLAPSED_FIELDS and not fieldset.expands(name):
+            fields.append((name, *COLLAPSED_FIELDS[name]))
+        else:
+            fields.append((name, *LIST_FIELDS[name]))
+    return fields
+
+
+def list_rows(queryset, fields):
+    """
+    Returns the transactions of ``queryset`` as named tuples holding the
+    columns of ``fields``, in one query.
+    """
+    columns = dict.fromkeys(KEYSET_COLUMNS)
+    for _name, field_columns, _formatter in fields:
+        columns.update(dict.fromkeys(field_columns))
+
+    if "tag_ids" in columns:
+        TransactionTag = Transaction.tags.through
+        # Ordered like the tags of a transaction, see Tag.Meta.ordering.
+        tag_ids = (
+            TransactionTag.objects.filter(transaction_id=OuterRef("pk"))
+            .order_by("tag__name")
+            .values("tag_id")
+        )
+        queryset = queryset.annotate(tag_ids=ArraySubquery(tag_ids))
+
+    return queryset.values_list(*columns, named=True)
+
+
+def to_representation(row, fields):
+    """
+    Formats a row of ``list_rows()`` the way ``TransactionSerializer`` does a
+    transaction: decimals as strings and dates in ISO 8601.
+    """
+    return {name: formatter(row) for name, _columns, formatter in fields}
@@ -0,0 +1,56 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.models import Account
+from apps.finance.services import calculate_payment_date, calculate_payment_dates
+
+
+class Command(BaseCommand):
+    help = (
+        "Time calculate_payment_dates() against calculate_payment_date() over "
+        "random credit card transaction dates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, default=1_000_000, help="Number of dates to compute"
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            default=10,
+            help="Spread the dates over this many years",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        account = Account(
+            type=Account.AccountType.CREDIT_CARD, closing_day=25, due_day_offset=10
+        )
+        rng = random.Random(options["seed"])
+        start = datetime.date(2020, 1, 1).toordinal()
+        span = 365 * options["years"]
+        dates = [
+            datetime.date.fromordinal(start + rng.randrange(span))
+            for _ in range(options["count"])
+        ]
+
+        started = time.perf_counter()
+        scalar = [calculate_payment_date(date, account) for date in dates]
+        scalar_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batched = calculate_payment_dates(dates, account)
+        batched_time = time.perf_counter() - started
+
+        if scalar != batched:
+            raise CommandError("The batched payment dates differ from the scalar ones")
+
+        self.stdout.write(f"scalar:  {scalar_time:.3f}s for {len(dates)} dates")
+        self.stdout.write(f"batched: {batched_time:.3f}s for {len(dates)} dates")
+        self.stdout.write(
+            self.style.SUCCESS(f"{scalar_time / batched_time:.1f}x faster")
+        )
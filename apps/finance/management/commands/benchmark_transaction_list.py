@@ -0,0 +1,114 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.finance.listing import list_fields, list_rows, to_representation
+from apps.finance.models import Account, InstallmentPlan, Tag, Transaction
+from apps.finance.serializers import TransactionSerializer
+from apps.users.models import CustomUser
+
+ORDERING = ("-payment_date", "-transaction_date", "-id")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the rows per second the transaction list renders to JSON "
+        "with TransactionSerializer and with the values-based rows of "
+        "apps.finance.listing. Seeds a throwaway user whose data is rolled "
+        "back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, default=5000, help="Number of transactions"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Keep the best of this many runs"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options["count"], random.Random(options["seed"]))
+            queryset = Transaction.objects.filter(user=user).order_by(*ORDERING)
+
+            def serializer():
+                data = TransactionSerializer(queryset, many=True).data
+                return JSONRenderer().render(data)
+
+            def values():
+                fields = list_fields()
+                data = [
+                    to_representation(row, fields)
+                    for row in list_rows(queryset, fields)
+                ]
+                return JSONRenderer().render(data)
+
+            results = {}
+            for name, render in (("serializer", serializer), ("values", values)):
+                results[name] = self.measure(render, options["repeat"])
+            transaction.set_rollback(True)
+
+        serializer_content, serializer_time = results["serializer"]
+        values_content, values_time = results["values"]
+        if serializer_content != values_content:
+            raise CommandError("The values-based rows differ from the serializer's")
+
+        count = options["count"]
+        self.stdout.write(f"serializer: {count / serializer_time:10.0f} rows/s")
+        self.stdout.write(f"values:     {count / values_time:10.0f} rows/s")
+        self.stdout.write(
+            self.style.SUCCESS(f"{serializer_time / values_time:.1f}x faster")
+        )
+
+    def measure(self, render, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return content, best
+
+    def seed(self, count, rng):
+        user = CustomUser.objects.create_user(
+            email=f"benchmark-{rng.randrange(10**9)}@example.com", password=None
+        )
+        account = Account.objects.create(
+            user=user, name="Benchmark", type=Account.AccountType.CHECKING
+        )
+        tags = Tag.objects.bulk_create(
+            Tag(user=user, name=f"Tag {i}") for i in range(5)
+        )
+        plan = InstallmentPlan.objects.create(
+            description="Benchmark plan", total_amount=1200, total_installments=12
+        )
+
+        start = datetime.date(2020, 1, 1).toordinal()
+        transactions = Transaction.objects.bulk_create(
+            Transaction(
+                user=user,
+                account=account,
+                type=rng.choice(Transaction.TransactionType.values),
+                description=f"Transaction {i}",
+                amount=Decimal(rng.randrange(1, 100_000)) / 100,
+                transaction_date=datetime.date.fromordinal(start + rng.randrange(1500)),
+                payment_date=datetime.date.fromordinal(start + rng.randrange(1500)),
+                installment_plan=plan if i % 4 == 0 else None,
+                installment_number=i % 12 + 1 if i % 4 == 0 else None,
+            )
+            for i in range(count)
+        )
+
+        TransactionTag = Transaction.tags.through
+        TransactionTag.objects.bulk_create(
+            TransactionTag(transaction_id=txn.id, tag_id=tag.id)
+            for txn in transactions
+            for tag in rng.sample(tags, rng.randrange(len(tags)))
+        )
+        return user
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.models import Account
+from apps.finance.services import find_balance_mismatches, rebuild_account_balances
+
+
+class Command(BaseCommand):
+    help = "Rebuild or verify the stored account balances from their transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report drifted balances, exit with an error if any are found",
+        )
+        parser.add_argument(
+            "--user", type=int, help="Restrict to the accounts of this user id"
+        )
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+        if options["user"]:
+            accounts = accounts.filter(user_id=options["user"])
+
+        if options["verify"]:
+            self.verify(accounts)
+            return
+
+        count = rebuild_account_balances(accounts)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt balances of {count} accounts"))
+
+    def verify(self, accounts):
+        mismatches = find_balance_mismatches(accounts)
+        for account_id, currency, stored, expected in mismatches:
+            label = currency or "total"
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Account {account_id} ({label}): "
+                    f"stored {stored}, expected {expected}"
+                )
+            )
+
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} balances are out of date")
+
+        self.stdout.write(self.style.SUCCESS("All balances are up to date"))
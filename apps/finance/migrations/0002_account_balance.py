@@ -0,0 +1,78 @@
+# Generated by Django 6.0.9 on 2026-10-18 03:31
+
+import django.db.models.deletion
+import djmoney.models.fields
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+
+
+def backfill_balances(apps, schema_editor):
+    Account = apps.get_model("finance", "Account")
+    AccountBalance = apps.get_model("finance", "AccountBalance")
+    Transaction = apps.get_model("finance", "Transaction")
+
+    rows = (
+        Transaction.objects.values("account_id", "amount_currency")
+        .annotate(
+            balance=Sum(
+                Case(
+                    When(type="income", then=F("amount")),
+                    When(type="expense", then=-F("amount")),
+                    default=Value(0),
+                    output_field=DecimalField(),
+                )
+            )
+        )
+        .order_by()
+    )
+
+    totals = {}
+    balances = []
+    for row in rows:
+        account_id = row["account_id"]
+        totals[account_id] = totals.get(account_id, 0) + row["balance"]
+        balances.append(
+            AccountBalance(
+                account_id=account_id,
+                currency=row["amount_currency"],
+                amount=row["balance"],
+            )
+        )
+
+    AccountBalance.objects.bulk_create(balances, batch_size=1000)
+    Account.objects.bulk_update(
+        [Account(pk=pk, balance=total) for pk, total in totals.items()],
+        ["balance"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='balance',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('currency', djmoney.models.fields.CurrencyField(default=None, max_length=3)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='finance.account')),
+            ],
+            options={
+                'ordering': ['currency'],
+                'unique_together': {('account', 'currency')},
+            },
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
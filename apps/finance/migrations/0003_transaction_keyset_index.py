@@ -0,0 +1,17 @@
+# Generated by Django 6.0.9 on 2026-10-18 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_account_balance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-payment_date', '-transaction_date', '-id'], name='finance_txn_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.9 on 2026-10-18 03:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_user(apps, schema_editor):
+    Account = apps.get_model("finance", "Account")
+    Transaction = apps.get_model("finance", "Transaction")
+
+    owner = Account.objects.filter(pk=OuterRef("account_id")).values("user_id")
+    Transaction.objects.filter(user__isnull=True).update(user_id=Subquery(owner[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_importjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_user, migrations.RunPython.noop),
+    ]
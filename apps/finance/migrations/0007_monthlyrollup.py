@@ -0,0 +1,127 @@
+# Generated by Django 6.0.9 on 2026-10-18 03:42
+
+import django.db.models.deletion
+import djmoney.models.fields
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    MonthlyRollup = apps.get_model("finance", "MonthlyRollup")
+    Transaction = apps.get_model("finance", "Transaction")
+
+    rows = (
+        Transaction.objects.annotate(
+            month=TruncMonth(Coalesce("payment_date", "transaction_date"))
+        )
+        .values(
+            "user_id", "account_id", "category_id", "type", "amount_currency", "month"
+        )
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    MonthlyRollup.objects.bulk_create(
+        (
+            MonthlyRollup(
+                user_id=row["user_id"],
+                account_id=row["account_id"],
+                category_id=row["category_id"],
+                type=row["type"],
+                currency=row["amount_currency"],
+                month=row["month"],
+                total=row["total"],
+                count=row["count"],
+            )
+            for row in rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0006_transaction_user_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("type", models.CharField(max_length=20)),
+                (
+                    "currency",
+                    djmoney.models.fields.CurrencyField(default=None, max_length=3),
+                ),
+                ("month", models.DateField()),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=16),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to="finance.account",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to="finance.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["month"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "month"], name="finance_mon_user_id_dff36c_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "user",
+                            "account",
+                            "category",
+                            "type",
+                            "currency",
+                            "month",
+                        ),
+                        name="finance_rollup_unique_key",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.9 on 2026-10-18 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0008_sync_tombstones"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="account",
+            name="balance",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=14
+            ),
+        ),
+    ]
@@ -1,3 +1,6 @@
 from .account import *  # noqa
 from .transaction import *  # noqa
 from .category import *  # noqa
+from .imports import *  # noqa
+from .rollup import *  # noqa
+from .sync import *  # noqa
@@ -1,7 +1,12 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 from djmoney.models.fields import CurrencyField
 
 from apps.core.models import BaseModel
+from apps.finance.models.sync import Tombstone
 from apps.users.models import CustomUser
 
 
@@ -26,11 +31,112 @@ class Account(BaseModel):
     currency = CurrencyField(default="USD")
     closing_day = models.PositiveIntegerField(null=True, blank=True)
     due_day_offset = models.PositiveIntegerField(default=10)
+    # Running total of income minus expenses, maintained by Transaction.save()
+    # and Transaction.delete(). Rebuild with `manage.py rebuild_balances`.
+    balance = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, editable=False
+    )
 
     class Meta:
         unique_together = ("user", "name")
         ordering = ["name"]
-        indexes = [models.Index(fields=["user"])]
+        indexes = [
+            models.Index(fields=["user"]),
+            models.Index(fields=["user", "updated_at"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.currency})"
+
+    def save(self, *args, update_fields=None, **kwargs):
+        # The balance only moves through AccountBalance.objects.apply_entries()
+        # and rebuild_account_balances(): writing back the value an instance
+        # was loaded with would undo the entries posted since.
+        if not self._state.adding:
+            if update_fields is None:
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name != "balance"
+                ]
+            else:
+                update_fields = [name for name in update_fields if name != "balance"]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # The transactions go with the account, tell sync clients too,
+            # along with the transfers on other accounts that lose a partner.
+            self.transactions.model.objects.filter(
+                transfer_partner__account=self
+            ).exclude(account=self).update(updated_at=timezone.now())
+            Tombstone.objects.record(
+                self.user_id,
+                Tombstone.Kind.TRANSACTION,
+                self.transactions.values_list("pk", flat=True),
+            )
+            Tombstone.objects.record(self.user_id, Tombstone.Kind.ACCOUNT, [self.pk])
+            return super().delete(*args, **kwargs)
+
+
+class AccountBalanceManager(models.Manager):
+    def apply_entries(self, entries):
+        """
+        Adds ledger entries to the stored balances.
+
+        Each entry is an ``(account_id, currency, delta)`` tuple. Entries are
+        grouped so every account and (account, currency) pair is written with
+        a single ``UPDATE ... SET balance = balance + delta``.
+        """
+        per_account = defaultdict(int)
+        per_currency = defaultdict(int)
+        for account_id, currency, delta in entries:
+            per_account[account_id] += delta
+            per_currency[(account_id, currency)] += delta
+
+        now = timezone.now()
+        with transaction.atomic():
+            for account_id, delta in per_account.items():
+                if delta:
+                    Account.objects.filter(pk=account_id).update(
+                        balance=F("balance") + delta, updated_at=now
+                    )
+
+            for (account_id, currency), delta in per_currency.items():
+                if delta:
+                    self._add(account_id, currency, delta)
+
+    def _add(self, account_id, currency, delta):
+        rows = self.filter(account_id=account_id, currency=currency)
+        if rows.update(amount=F("amount") + delta):
+            return
+
+        try:
+            with transaction.atomic():
+                self.create(account_id=account_id, currency=currency, amount=delta)
+        except IntegrityError:
+            # Created concurrently by another transaction, add on top of it.
+            rows.update(amount=F("amount") + delta)
+
+
+class AccountBalance(BaseModel):
+    """
+    Per-currency running total of the transactions of an account.
+    """
+
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name="balances",
+    )
+    currency = CurrencyField()
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = AccountBalanceManager()
+
+    class Meta:
+        unique_together = ("account", "currency")
+        ordering = ["currency"]
+
+    def __str__(self):
+        return f"{self.account_id} {self.amount} {self.currency}"
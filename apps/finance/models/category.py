@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from apps.core.models import BaseModel
+from apps.finance.models.sync import Tombstone
 from apps.users.models import CustomUser
 
 
@@ -15,11 +17,31 @@ class Category(BaseModel):
     class Meta:
         unique_together = ("user", "name")
         ordering = ["name"]
-        indexes = [models.Index(fields=["user"])]
+        indexes = [
+            models.Index(fields=["user"]),
+            models.Index(fields=["user", "updated_at"]),
+        ]
 
     def __str__(self):
         return self.name
 
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # The transactions are kept without a category, which the
+            # SET_NULL update alone would hide from sync clients.
+            self.transactions.update(updated_at=timezone.now())
+            Tombstone.objects.record(self.user_id, Tombstone.Kind.CATEGORY, [self.pk])
+            # The rollups of the category are deleted with it: move their
+            # totals to the uncategorized ones first.
+            rollups = self.monthly_rollups.select_for_update().values_list(
+                "user_id", "account_id", "type", "currency", "month", "total", "count"
+            )
+            self.monthly_rollups.model.objects.apply_entries(
+                ((user_id, account_id, None, kind, currency, month), total, count)
+                for user_id, account_id, kind, currency, month, total, count in rollups
+            )
+            return super().delete(*args, **kwargs)
+
 
 class Tag(BaseModel):
     class Color(models.TextChoices):
@@ -57,7 +79,17 @@ class Tag(BaseModel):
     class Meta:
         unique_together = ("user", "name")
         ordering = ["name"]
-        indexes = [models.Index(fields=["user"])]
+        indexes = [
+            models.Index(fields=["user"]),
+            models.Index(fields=["user", "updated_at"]),
+        ]
 
     def __str__(self):
         return self.name
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # Untagged transactions change too, bump them for sync clients.
+            self.transactions.update(updated_at=timezone.now())
+            Tombstone.objects.record(self.user_id, Tombstone.Kind.TAG, [self.pk])
+            return super().delete(*args, **kwargs)
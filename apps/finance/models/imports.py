@@ -0,0 +1,55 @@
+from django.db import models
+
+from apps.core.models import BaseModel
+from apps.finance.models.account import Account
+from apps.users.models import CustomUser
+
+
+class ImportJob(BaseModel):
+    """
+    A bank statement upload, parsed and written in batches by the
+    ``import_transactions`` Celery task.
+    """
+
+    class FileFormat(models.TextChoices):
+        CSV = "csv", "CSV"
+        OFX = "ofx", "OFX"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    # Only the first errors are kept, the rest are only counted.
+    MAX_ERRORS = 500
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="import_jobs",
+    )
+    file = models.FileField(upload_to="imports/%Y/%m/")
+    file_format = models.CharField(max_length=10, choices=FileFormat.choices)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    detail = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at"])]
+
+    def __str__(self):
+        return f"{self.file.name} ({self.status})"
@@ -0,0 +1,120 @@
+from collections import defaultdict
+from itertools import batched
+
+from django.db import connections, models, router
+from django.utils import timezone
+from djmoney.models.fields import CurrencyField
+
+from apps.core.models import BaseModel
+from apps.finance.models.account import Account
+from apps.finance.models.category import Category
+from apps.users.models import CustomUser
+
+ROLLUP_KEY_CONSTRAINT = "finance_rollup_unique_key"
+
+
+class MonthlyRollupManager(models.Manager):
+    UPSERT_BATCH_SIZE = 500
+
+    def apply_entries(self, entries):
+        """
+        Adds rollup entries to the stored totals.
+
+        Each entry is a ``(key, amount, count)`` tuple where ``key`` is
+        ``(user_id, account_id, category_id, type, currency, month)``. Entries
+        are grouped and written with ``INSERT ... ON CONFLICT DO UPDATE``, so
+        the number of queries does not depend on how many months are touched.
+        """
+        grouped = defaultdict(lambda: [0, 0])
+        for key, amount, count in entries:
+            grouped[key][0] += amount
+            grouped[key][1] += count
+
+        now = timezone.now()
+        rows = [
+            (now, now, *key, amount, count)
+            for key, (amount, count) in grouped.items()
+            if amount or count
+        ]
+        for batch in batched(rows, self.UPSERT_BATCH_SIZE):
+            self._upsert(batch)
+
+    def _upsert(self, rows):
+        connection = connections[router.db_for_write(self.model)]
+        qn = connection.ops.quote_name
+        table = qn(self.model._meta.db_table)
+        columns = (
+            "created_at",
+            "updated_at",
+            "user_id",
+            "account_id",
+            "category_id",
+            "type",
+            "currency",
+            "month",
+            "total",
+            "count",
+        )
+        placeholders = ", ".join(
+            ["(%s)" % ", ".join(["%s"] * len(columns))] * len(rows)
+        )
+        sql = (
+            f"INSERT INTO {table} ({', '.join(qn(c) for c in columns)}) "
+            f"VALUES {placeholders} "
+            f"ON CONFLICT ON CONSTRAINT {qn(ROLLUP_KEY_CONSTRAINT)} DO UPDATE SET "
+            f"{qn('total')} = {table}.{qn('total')} + EXCLUDED.{qn('total')}, "
+            f"{qn('count')} = {table}.{qn('count')} + EXCLUDED.{qn('count')}, "
+            f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')}"
+        )
+        params = [value for row in rows for value in row]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+class MonthlyRollup(BaseModel):
+    """
+    Sum and count of transactions per user, account, category, type, currency
+    and month of ``payment_date`` (``transaction_date`` when it is not set).
+
+    Maintained by Transaction.save() and Transaction.delete(); rebuilt by the
+    ``rebuild_monthly_rollups`` task.
+    """
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups",
+    )
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="monthly_rollups",
+    )
+    type = models.CharField(max_length=20)
+    currency = CurrencyField()
+    month = models.DateField()
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    objects = MonthlyRollupManager()
+
+    class Meta:
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "account", "category", "type", "currency", "month"],
+                name=ROLLUP_KEY_CONSTRAINT,
+                nulls_distinct=False,
+            )
+        ]
+        indexes = [models.Index(fields=["user", "month"])]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.type} {self.total} {self.currency}"
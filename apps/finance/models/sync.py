@@ -0,0 +1,44 @@
+from django.db import models
+
+from apps.core.models import BaseModel
+from apps.users.models import CustomUser
+
+
+class TombstoneManager(models.Manager):
+    def record(self, user_id, kind, ids):
+        """
+        Records the deletion of the ``kind`` objects with the given ids.
+        """
+        self.bulk_create(
+            [Tombstone(user_id=user_id, kind=kind, object_id=pk) for pk in ids],
+            batch_size=1000,
+        )
+
+
+class Tombstone(BaseModel):
+    """
+    Marks a deleted account, category, tag or transaction so the delta sync
+    endpoint can tell clients to drop it. ``created_at`` is the deletion time.
+    """
+
+    class Kind(models.TextChoices):
+        ACCOUNT = "account", "Account"
+        CATEGORY = "category", "Category"
+        TAG = "tag", "Tag"
+        TRANSACTION = "transaction", "Transaction"
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="tombstones",
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+
+    objects = TombstoneManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "created_at"])]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
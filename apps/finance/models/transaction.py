@@ -1,10 +1,13 @@
-from django.db import models
+from django.db import models, transaction
 
 from djmoney.models.fields import MoneyField
 
 from apps.core.models import BaseModel
-from apps.finance.models.account import Account
+from apps.finance.models.account import Account, AccountBalance
 from apps.finance.models.category import Category, Tag
+from apps.finance.models.rollup import MonthlyRollup
+from apps.finance.models.sync import Tombstone
+from apps.users.models import CustomUser
 
 
 class Transaction(BaseModel):
@@ -22,6 +25,13 @@ class Transaction(BaseModel):
         on_delete=models.CASCADE,
         related_name="transactions",
     )
+    # Denormalized from account.user so owner-scoped queries skip the join.
+    # Kept in sync by save(); bulk_create() callers must set it themselves.
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="transactions",
+    )
     category = models.ForeignKey(
         Category,
         on_delete=models.SET_NULL,
@@ -49,26 +59,153 @@ class Transaction(BaseModel):
     class Meta:
         ordering = ["-payment_date", "-transaction_date"]
         indexes = [
+            # Keyset pagination order, see TransactionCursorPagination.
+            models.Index(
+                fields=["user", "-payment_date", "-transaction_date", "-id"],
+                name="finance_txn_keyset_idx",
+            ),
+            # Common TransactionFilter combinations.
+            models.Index(
+                fields=["user", "category", "payment_date"],
+                name="finance_txn_user_cat_idx",
+            ),
+            models.Index(
+                fields=["user", "type", "payment_date"],
+                name="finance_txn_user_type_idx",
+            ),
             models.Index(fields=["account", "payment_date"]),
             models.Index(fields=["payment_date"]),
             models.Index(fields=["category"]),
             models.Index(fields=["installment_plan"]),
+            # Delta sync, see apps.finance.sync.
+            models.Index(
+                fields=["user", "updated_at", "id"], name="finance_txn_sync_idx"
+            ),
         ]
 
+    # Fields that feed the account balances and the monthly rollups.
+    TRACKED_FIELDS = (
+        "account_id",
+        "user_id",
+        "category_id",
+        "type",
+        "amount",
+        "amount_currency",
+        "transaction_date",
+        "payment_date",
+    )
+
     def __str__(self):
         return f"{self.description} - {self.amount} on {self.transaction_date}"
 
+    @property
+    def tracked_state(self):
+        to_date = self._meta.get_field("transaction_date").to_python
+        return (
+            self.account_id,
+            self.user_id,
+            self.category_id,
+            self.type,
+            self.amount.amount,
+            str(self.amount.currency),
+            to_date(self.transaction_date),
+            to_date(self.payment_date),
+        )
+
+    @classmethod
+    def post_changes(cls, added=(), removed=()):
+        """
+        Applies the given tracked states to the account balances and the
+        monthly rollups: ``added`` ones are counted in, ``removed`` ones out.
+        """
+        ledger = []
+        rollups = []
+        for states, sign in ((added, 1), (removed, -1)):
+            for (
+                account_id,
+                user_id,
+                category_id,
+                kind,
+                amount,
+                currency,
+                transaction_date,
+                payment_date,
+            ) in states:
+                if kind == cls.TransactionType.EXPENSE:
+                    balance = -amount
+                elif kind == cls.TransactionType.INCOME:
+                    balance = amount
+                else:
+                    balance = 0
+                ledger.append((account_id, currency, sign * balance))
+
+                month = (payment_date or transaction_date).replace(day=1)
+                key = (user_id, account_id, category_id, kind, currency, month)
+                rollups.append((key, sign * amount, sign))
+
+        AccountBalance.objects.apply_entries(ledger)
+        MonthlyRollup.objects.apply_entries(rollups)
+
+    @classmethod
+    def post_created(cls, transactions):
+        """
+        Counts in transactions saved with ``bulk_create()``, which skips save().
+        """
+        cls.post_changes(added=[txn.tracked_state for txn in transactions])
+
+    def _lock_stored_state(self):
+        """
+        Returns the tracked state of the stored row, locked until the end of
+        the transaction, or None when there is none.
+
+        The state the instance was loaded with would not do: two stale copies
+        of the row would both post its removal.
+        """
+        if self._state.adding:
+            return None
+        return (
+            type(self)
+            ._base_manager.select_for_update()
+            .filter(pk=self.pk)
+            .values_list(*self.TRACKED_FIELDS)
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        if self.account_id is not None:
+            self.user_id = self.account.user_id
+
+        with transaction.atomic():
+            previous = self._lock_stored_state()
+            super().save(*args, **kwargs)
+            current = self.tracked_state
+
+            if previous != current:
+                self.post_changes(
+                    added=[current], removed=[previous] if previous else []
+                )
+
     def delete(self, *args, **kwargs):
-        if self.transfer_partner:
-            partner = self.transfer_partner
-            self.transfer_partner = None
-            self.save()
+        with transaction.atomic():
+            if self.transfer_partner:
+                partner = self.transfer_partner
+                self.transfer_partner = None
+                self.save()
+
+                partner.transfer_partner = None
+                partner.save()
+                partner.delete()
+
+            pk = self.pk
+            previous = self._lock_stored_state()
+            result = super().delete(*args, **kwargs)
 
-            partner.transfer_partner = None
-            partner.save()
-            partner.delete()
+            # Already deleted, e.g. by a retried request.
+            if previous and result[1].get(self._meta.label):
+                self.post_changes(removed=[previous])
+                Tombstone.objects.record(self.user_id, Tombstone.Kind.TRANSACTION, [pk])
 
-        super().delete(*args, **kwargs)
+        return result
 
 
 class InstallmentPlan(BaseModel):
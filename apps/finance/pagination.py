@@ -0,0 +1,203 @@
+import datetime
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TransactionCursorPagination(BasePagination):
+    """
+    Keyset pagination over ``(payment_date, transaction_date, id)``.
+
+    Follows ``Transaction.Meta.ordering`` with ``id`` as a tiebreaker, so every
+    page is a range scan on the matching composite index instead of an
+    ``OFFSET``. ``payment_date`` is nullable and null rows sort first, the way
+    Postgres orders a descending column by default.
+
+    The cursor is an opaque, base64-encoded position holding the last row of
+    the current page (or the first one, when paging backwards). Rows may be
+    transactions or named tuples with the same attributes.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    ordering = (
+        F("payment_date").desc(nulls_first=True),
+        F("transaction_date").desc(),
+        F("id").desc(),
+    )
+    reverse_ordering = (
+        F("payment_date").asc(nulls_last=True),
+        F("transaction_date").asc(),
+        F("id").asc(),
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor["reverse"])
+
+        if self.reverse:
+            queryset = queryset.order_by(*self.reverse_ordering)
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if cursor:
+            queryset = queryset.filter(self.get_position_filter(cursor))
+
+        # Fetch one extra row to know whether there is a page beyond this one.
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position_filter(self, cursor):
+        """
+        Builds the keyset condition selecting the rows after ``cursor`` in the
+        direction of the current ordering.
+        """
+        payment_date = cursor["payment_date"]
+        transaction_date = cursor["transaction_date"]
+        pk = cursor["id"]
+
+        lt = "gt" if cursor["reverse"] else "lt"
+        within_day = Q(**{f"transaction_date__{lt}": transaction_date}) | Q(
+            transaction_date=transaction_date, **{f"id__{lt}": pk}
+        )
+
+        if payment_date is None:
+            if cursor["reverse"]:
+                return Q(payment_date__isnull=True) & within_day
+            return Q(payment_date__isnull=False) | (
+                Q(payment_date__isnull=True) & within_day
+            )
+
+        # The redundant bound on payment_date lets the planner turn the
+        # disjunction into a single index range scan.
+        if cursor["reverse"]:
+            return Q(payment_date__isnull=True) | (
+                Q(payment_date__gte=payment_date)
+                & (
+                    Q(payment_date__gt=payment_date)
+                    | (Q(payment_date=payment_date) & within_day)
+                )
+            )
+        return Q(payment_date__lte=payment_date) & (
+            Q(payment_date__lt=payment_date)
+            | (Q(payment_date=payment_date) & within_day)
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            payment_date = tokens["p"][0]
+            return {
+                "payment_date": (
+                    datetime.date.fromisoformat(payment_date) if payment_date else None
+                ),
+                "transaction_date": datetime.date.fromisoformat(tokens["t"][0]),
+                "id": int(tokens["i"][0]),
+                "reverse": bool(int(tokens.get("r", ["0"])[0])),
+            }
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        tokens = {
+            "p": row.payment_date.isoformat() if row.payment_date else "",
+            "t": row.transaction_date.isoformat(),
+            "i": row.id,
+        }
+        if reverse:
+            tokens["r"] = "1"
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
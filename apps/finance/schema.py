@@ -1,4 +1,30 @@
-from drf_spectacular.utils import OpenApiExample
+"""
+OpenAPI documentation of the finance views.
+
+Only imported by ``apps.core.schema.SchemaGenerator``, so serving requests
+never loads the examples nor drf-spectacular's schema machinery.
+"""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+)
+
+from apps.finance.exports import EXPORT_FORMATS
+from apps.finance.serializers import MONTHLY_REPORT_DIMENSIONS
+from apps.finance.views import (
+    AccountViewSet,
+    CategoryViewSet,
+    ImportJobViewSet,
+    MonthlyReportView,
+    SyncView,
+    TagViewSet,
+    TransactionViewSet,
+)
 
 
 class AccountExamples:
@@ -138,3 +164,127 @@ class TransactionExamples:
         },
         response_only=True,
     )
+
+
+class ImportJobExamples:
+    RESPONSE = OpenApiExample(
+        "Import Job Status",
+        value={
+            "id": 1,
+            "file": "/media/imports/2023/10/statement.csv",
+            "file_format": "csv",
+            "account": 1,
+            "status": "processing",
+            "processed_rows": 2000,
+            "created_count": 1998,
+            "error_count": 2,
+            "errors": [
+                {"line": 14, "error": "Invalid date: '2023-13-01'."},
+                {"line": 87, "error": "Unknown account: 'Old Card'."},
+            ],
+            "detail": "",
+            "created_at": "2023-10-27T10:00:00Z",
+            "updated_at": "2023-10-27T10:00:05Z",
+        },
+        response_only=True,
+    )
+
+
+# Sparse fieldsets, see apps.core.fieldsets.
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields", description="Comma separated fields to return, all by default."
+    ),
+    OpenApiParameter("omit", description="Comma separated fields to leave out."),
+]
+EXPAND_PARAMETER = OpenApiParameter(
+    "expand",
+    description=(
+        "Comma separated nested objects to return in full, the others as their "
+        "ids. All of them are expanded when left out."
+    ),
+)
+
+for view, parameters in (
+    (AccountViewSet, FIELDSET_PARAMETERS),
+    (CategoryViewSet, FIELDSET_PARAMETERS),
+    (TagViewSet, FIELDSET_PARAMETERS),
+    (TransactionViewSet, [*FIELDSET_PARAMETERS, EXPAND_PARAMETER]),
+):
+    extend_schema_view(
+        list=extend_schema(parameters=parameters),
+        retrieve=extend_schema(parameters=parameters),
+    )(view)
+
+extend_schema(
+    tags=["Finance"],
+    examples=[AccountExamples.CREATE_REQUEST, AccountExamples.RESPONSE],
+)(AccountViewSet)
+
+extend_schema(
+    tags=["Finance"],
+    examples=[CategoryExamples.CREATE_REQUEST, CategoryExamples.RESPONSE],
+)(CategoryViewSet)
+
+extend_schema(
+    tags=["Finance"],
+    examples=[TagExamples.CREATE_REQUEST, TagExamples.RESPONSE],
+)(TagViewSet)
+
+extend_schema_view(
+    export=extend_schema(
+        description=(
+            "Streams every transaction matching the filters as CSV or "
+            "newline-delimited JSON."
+        ),
+        parameters=[
+            OpenApiParameter("file_format", enum=list(EXPORT_FORMATS), default="csv"),
+        ],
+        responses={
+            (200, content_type): OpenApiResponse(OpenApiTypes.STR)
+            for content_type, _ in EXPORT_FORMATS.values()
+        },
+    ),
+)(TransactionViewSet)
+
+extend_schema(
+    tags=["Finance"],
+    examples=[
+        TransactionExamples.STANDARD_REQUEST,
+        TransactionExamples.TRANSFER_REQUEST,
+        TransactionExamples.INSTALLMENT_REQUEST,
+        TransactionExamples.RESPONSE,
+    ],
+)(TransactionViewSet)
+
+extend_schema(
+    tags=["Finance"],
+    examples=[ImportJobExamples.RESPONSE],
+)(ImportJobViewSet)
+
+extend_schema(
+    tags=["Finance"],
+    description=(
+        "Monthly totals read from the rollup table. Rows are grouped by month "
+        "and currency, plus the dimensions listed in group_by."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "group_by",
+            description="Comma separated subset of: account, category, type.",
+            default=",".join(MONTHLY_REPORT_DIMENSIONS),
+        ),
+    ],
+)(MonthlyReportView)
+
+extend_schema(
+    tags=["Finance"],
+    description=(
+        "Returns the accounts, categories, tags and transactions changed since "
+        "the given cursor, plus the ids deleted since then. Call it without a "
+        "cursor for a full snapshot, then pass the returned cursor as since."
+    ),
+    parameters=[
+        OpenApiParameter("since", description="Cursor returned by the last sync."),
+    ],
+)(SyncView)
@@ -1,29 +1,42 @@
 from dateutil.relativedelta import relativedelta
 from django.db import transaction
-from django.db.models import Case, DecimalField, F, Sum, Value, When
 from djmoney.money import Money
 from rest_framework import serializers
 
-from apps.finance.models import Account, Category, InstallmentPlan, Tag, Transaction
-from apps.finance.services import calculate_payment_date
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
+from apps.finance.models import (
+    Account,
+    Category,
+    ImportJob,
+    InstallmentPlan,
+    Tag,
+    Transaction,
+)
+from apps.finance.services import calculate_payment_date, calculate_payment_dates
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name", "user"]
         read_only_fields = ["user"]
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ["id", "name", "color", "user"]
         read_only_fields = ["user"]
 
 
-class AccountSerializer(serializers.ModelSerializer):
-    current_balance = serializers.SerializerMethodField()
+class AccountSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    current_balance = serializers.DecimalField(
+        source="balance",
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        read_only=True,
+    )
     currency = serializers.CharField()
 
     class Meta:
@@ -40,21 +53,6 @@ class AccountSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["user", "current_balance"]
 
-    def get_current_balance(self, obj):
-        qs = obj.transactions.all()
-        balance = qs.aggregate(
-            balance=Sum(
-                Case(
-                    When(type=Transaction.TransactionType.INCOME, then=F("amount")),
-                    When(type=Transaction.TransactionType.EXPENSE, then=-F("amount")),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            )
-        )["balance"]
-
-        return balance or 0
-
 
 class InstallmentPlanSerializer(serializers.ModelSerializer):
     class Meta:
@@ -68,7 +66,7 @@ class InstallmentPlanSerializer(serializers.ModelSerializer):
         ]
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     is_transfer = serializers.BooleanField(
         write_only=True,
         required=False,
@@ -242,24 +240,143 @@ class TransactionSerializer(serializers.ModelSerializer):
         share = round(total_val / total_installments, 2)
         remainder = total_val - (share * total_installments)
 
+        quota_dates = [
+            base_date + relativedelta(months=i) for i in range(total_installments)
+        ]
+        payment_dates = calculate_payment_dates(quota_dates, account)
+
         transactions = []
-        for i in range(total_installments):
+        for i, (quota_date, payment_date) in enumerate(zip(quota_dates, payment_dates)):
             current_amount = share
             if i == total_installments - 1:
                 current_amount += remainder
 
-            quota_date = base_date + relativedelta(months=i)
-            payment_date = calculate_payment_date(quota_date, account)
-
             txn_data = validated_data.copy()
             txn_data["amount"] = Money(current_amount, amount.currency)
             txn_data["transaction_date"] = quota_date
             txn_data["payment_date"] = payment_date
             txn_data["installment_number"] = i + 1
             txn_data["installment_plan"] = plan
-
-            txn = Transaction.objects.create(**txn_data)
-            txn.tags.set(tags)
-            transactions.append(txn)
+            txn_data["user_id"] = account.user_id
+            transactions.append(Transaction(**txn_data))
+
+        # bulk_create() skips Transaction.save(), so the installments are posted
+        # to the balances and rollups here, in one write per aggregate row.
+        transactions = Transaction.objects.bulk_create(transactions)
+        Transaction.post_created(transactions)
+
+        if tags:
+            TransactionTag = Transaction.tags.through
+            tag_ids = {tag.pk for tag in tags}
+            TransactionTag.objects.bulk_create(
+                TransactionTag(transaction_id=txn.pk, tag_id=tag_id)
+                for txn in transactions
+                for tag_id in tag_ids
+            )
 
         return transactions[0]
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    file_format = serializers.ChoiceField(
+        choices=ImportJob.FileFormat.choices, required=False
+    )
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "file",
+            "file_format",
+            "account",
+            "status",
+            "processed_rows",
+            "created_count",
+            "error_count",
+            "errors",
+            "detail",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "status",
+            "processed_rows",
+            "created_count",
+            "error_count",
+            "errors",
+            "detail",
+            "created_at",
+            "updated_at",
+        ]
+
+    def validate_account(self, account):
+        if account and account.user_id != self.context["request"].user.id:
+            raise serializers.ValidationError("Invalid account.")
+        return account
+
+    def validate(self, data):
+        if not data.get("file_format"):
+            extension = data["file"].name.rsplit(".", 1)[-1].lower()
+            if extension not in ImportJob.FileFormat.values:
+                raise serializers.ValidationError(
+                    {"file_format": "Could not be guessed from the file name."}
+                )
+            data["file_format"] = extension
+
+        if data["file_format"] == ImportJob.FileFormat.OFX and not data.get("account"):
+            raise serializers.ValidationError(
+                {"account": "Required for OFX statements."}
+            )
+
+        return data
+
+
+MONTHLY_REPORT_DIMENSIONS = ("account", "category", "type")
+
+
+class MonthlyReportSerializer(serializers.Serializer):
+    month = serializers.DateField(format="%Y-%m")
+    account = serializers.IntegerField(source="account_id", required=False)
+    category = serializers.IntegerField(
+        source="category_id", required=False, allow_null=True
+    )
+    type = serializers.CharField(required=False)
+    currency = serializers.CharField()
+    total = serializers.DecimalField(
+        source="total_sum", max_digits=16, decimal_places=2
+    )
+    count = serializers.IntegerField(source="count_sum")
+
+    def to_representation(self, instance):
+        # Dimensions left out of ``group_by`` are not part of the row.
+        data = super().to_representation(instance)
+        group_by = self.context["group_by"]
+        return {
+            key: value
+            for key, value in data.items()
+            if key not in MONTHLY_REPORT_DIMENSIONS or key in group_by
+        }
+
+
+class SyncDeletedSerializer(serializers.Serializer):
+    accounts = serializers.ListField(child=serializers.IntegerField())
+    categories = serializers.ListField(child=serializers.IntegerField())
+    tags = serializers.ListField(child=serializers.IntegerField())
+    transactions = serializers.ListField(child=serializers.IntegerField())
+
+
+class SyncSerializer(serializers.Serializer):
+    cursor = serializers.CharField(
+        help_text="Pass as `since` on the next call to get the later changes."
+    )
+    has_more = serializers.BooleanField(
+        help_text="More transactions are pending, sync again right away."
+    )
+    reset = serializers.BooleanField(
+        help_text="This is a full snapshot, drop the objects cached so far."
+    )
+    accounts = AccountSerializer(many=True)
+    categories = CategorySerializer(many=True)
+    tags = TagSerializer(many=True)
+    transactions = TransactionSerializer(many=True)
+    deleted = SyncDeletedSerializer()
@@ -1,8 +1,24 @@
 import datetime
+from collections import defaultdict
+from decimal import Decimal
 
 from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateField,
+    DecimalField,
+    F,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
 
-from apps.finance.models import Account
+from apps.core.etags import bump_versions_on_commit
+from apps.finance.models import Account, AccountBalance, MonthlyRollup, Transaction
 
 
 def calculate_payment_date(
@@ -50,3 +66,210 @@ def calculate_payment_date(
     payment_date = target_month_first + datetime.timedelta(days=days_to_add)
 
     return payment_date
+
+
+def calculate_payment_dates(transaction_dates, account: Account) -> list:
+    """
+    Batched counterpart of calculate_payment_date() for many dates of the same
+    account, in the same order.
+
+    Every date of a statement cycle (same month, same side of the closing day)
+    shares its payment date, so the date arithmetic runs once per cycle and
+    the rest is a dict lookup. Accepts any iterable of dates, including NumPy
+    ``datetime64[D]`` arrays.
+    """
+    if hasattr(transaction_dates, "tolist"):
+        transaction_dates = transaction_dates.tolist()
+
+    if account.type != Account.AccountType.CREDIT_CARD or not account.closing_day:
+        return list(transaction_dates)
+
+    closing_day = account.closing_day
+    cycles = {}
+    payment_dates = []
+    append = payment_dates.append
+    for transaction_date in transaction_dates:
+        cycle = (transaction_date.year * 12 + transaction_date.month) * 2 + (
+            transaction_date.day > closing_day
+        )
+        try:
+            append(cycles[cycle])
+        except KeyError:
+            cycles[cycle] = calculate_payment_date(transaction_date, account)
+            append(cycles[cycle])
+
+    return payment_dates
+
+
+def compute_account_balances(accounts) -> dict:
+    """
+    Aggregates the transactions of the given accounts from scratch.
+
+    Returns a mapping of ``account_id`` to ``{currency: balance}`` computed with a
+    single grouped query. Accounts without transactions map to an empty dict.
+    """
+    account_ids = list(accounts.values_list("id", flat=True))
+    balances = {account_id: {} for account_id in account_ids}
+    rows = (
+        Transaction.objects.filter(account_id__in=account_ids)
+        .values("account_id", "amount_currency")
+        .annotate(
+            balance=Sum(
+                Case(
+                    When(type=Transaction.TransactionType.INCOME, then=F("amount")),
+                    When(type=Transaction.TransactionType.EXPENSE, then=-F("amount")),
+                    default=Value(0),
+                    output_field=DecimalField(),
+                )
+            )
+        )
+        .order_by()
+    )
+    for row in rows:
+        balances[row["account_id"]][row["amount_currency"]] = row["balance"]
+
+    return balances
+
+
+def find_balance_mismatches(accounts) -> list:
+    """
+    Compares the stored balances of the given accounts with a fresh aggregate.
+
+    Returns ``(account_id, currency, stored, expected)`` tuples for every
+    stored value that drifted. ``currency`` is ``None`` for ``Account.balance``.
+    """
+    expected = compute_account_balances(accounts)
+
+    stored = defaultdict(dict)
+    for balance in AccountBalance.objects.filter(account__in=accounts):
+        stored[balance.account_id][balance.currency] = balance.amount
+
+    mismatches = []
+    for account_id, balance in accounts.values_list("id", "balance"):
+        per_currency = expected[account_id]
+        total = sum(per_currency.values(), Decimal(0))
+        if balance != total:
+            mismatches.append((account_id, None, balance, total))
+
+        for currency in sorted(per_currency.keys() | stored[account_id].keys()):
+            stored_amount = stored[account_id].get(currency, Decimal(0))
+            expected_amount = per_currency.get(currency, Decimal(0))
+            if stored_amount != expected_amount:
+                mismatches.append(
+                    (account_id, currency, stored_amount, expected_amount)
+                )
+
+    return mismatches
+
+
+@transaction.atomic
+def rebuild_account_balances(accounts) -> int:
+    """
+    Recomputes ``Account.balance`` and the per-currency ``AccountBalance`` rows
+    of the given accounts from their transactions. Returns the number of
+    accounts rebuilt.
+    """
+    expected = compute_account_balances(accounts.select_for_update())
+
+    AccountBalance.objects.filter(account_id__in=expected.keys()).delete()
+    AccountBalance.objects.bulk_create(
+        AccountBalance(account_id=account_id, currency=currency, amount=amount)
+        for account_id, per_currency in expected.items()
+        for currency, amount in per_currency.items()
+    )
+
+    to_update = [
+        Account(pk=account_id, balance=sum(per_currency.values(), Decimal(0)))
+        for account_id, per_currency in expected.items()
+    ]
+    Account.objects.bulk_update(to_update, ["balance"], batch_size=500)
+
+    return len(to_update)
+
+
+@transaction.atomic
+def rebuild_user_rollups(user_id) -> int:
+    """
+    Recomputes the monthly rollups of a user from their transactions with a
+    single grouped query. Returns the number of rollup rows written.
+    """
+    rows = (
+        Transaction.objects.filter(user_id=user_id)
+        .annotate(
+            month=TruncMonth(Coalesce("payment_date", "transaction_date")),
+        )
+        .values("account_id", "category_id", "type", "amount_currency", "month")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+    MonthlyRollup.objects.filter(user_id=user_id).delete()
+    rollups = MonthlyRollup.objects.bulk_create(
+        (
+            MonthlyRollup(
+                user_id=user_id,
+                account_id=row["account_id"],
+                category_id=row["category_id"],
+                type=row["type"],
+                currency=row["amount_currency"],
+                month=row["month"],
+                total=row["total"],
+                count=row["count"],
+            )
+            for row in rows
+        ),
+        batch_size=1000,
+    )
+    return len(rollups)
+
+
+@transaction.atomic
+def recompute_payment_dates(account_id) -> int:
+    """
+    Brings the payment dates of an account's transactions in line with its
+    current type, closing_day and due_day_offset. Returns the number of
+    transactions that moved.
+
+    Consecutive transaction dates sharing a payment date are folded into one
+    range, so the whole account is fixed by a single ``UPDATE ... CASE`` with
+    a branch per statement cycle.
+    """
+    account = Account.objects.select_for_update().get(pk=account_id)
+    transactions = Transaction.objects.filter(account_id=account_id)
+
+    if account.type != Account.AccountType.CREDIT_CARD or not account.closing_day:
+        payment_date = F("transaction_date")
+    else:
+        dates = list(
+            transactions.order_by("transaction_date")
+            .values_list("transaction_date", flat=True)
+            .distinct()
+        )
+        cycles = []
+        for date, due in zip(dates, calculate_payment_dates(dates, account)):
+            if cycles and cycles[-1][2] == due:
+                cycles[-1][1] = date
+            else:
+                cycles.append([date, date, due])
+
+        # Rows added since the dates were read already got the new settings.
+        payment_date = Case(
+            *(
+                When(transaction_date__range=(first, last), then=Value(due))
+                for first, last, due in cycles
+            ),
+            default=F("payment_date"),
+            output_field=DateField(),
+        )
+
+    moved = (
+        transactions.exclude(payment_date=payment_date)
+        .order_by()
+        .update(payment_date=payment_date, updated_at=timezone.now())
+    )
+    if moved:
+        # update() bypasses Transaction.save(), and the rollups are keyed by
+        # the payment month.
+        rebuild_user_rollups(account.user_id)
+        bump_versions_on_commit(account.user_id, ("transactions",))
+    return moved
@@ -0,0 +1,117 @@
+import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import defaultdict
+from urllib import parse
+
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.finance.models import Account, Category, Tag, Tombstone, Transaction
+
+SYNC_PAGE_SIZE = 1000
+# Rows are stamped with updated_at before their transaction commits, so a slow
+# writer can make a change visible after a newer one was already synced. The
+# next sync starts this far back to pick such rows up; clients upsert by id,
+# so seeing a row twice is harmless.
+SYNC_OVERLAP = datetime.timedelta(seconds=30)
+# Tombstones are purged after this long. Clients behind it get a full resync.
+SYNC_RETENTION = datetime.timedelta(days=30)
+
+
+def encode_cursor(timestamp, pk=None):
+    tokens = {"t": timestamp.isoformat()}
+    if pk is not None:
+        tokens["i"] = pk
+    querystring = parse.urlencode(tokens)
+    return urlsafe_b64encode(querystring.encode("ascii")).decode("ascii")
+
+
+def decode_cursor(encoded):
+    """
+    Returns the ``(timestamp, pk)`` position of a cursor. Raises ValueError
+    when it is malformed.
+    """
+    try:
+        querystring = urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+        tokens = parse.parse_qs(querystring)
+        timestamp = datetime.datetime.fromisoformat(tokens["t"][0])
+        pk = int(tokens["i"][0]) if "i" in tokens else None
+    except (TypeError, ValueError, KeyError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if timezone.is_naive(timestamp):
+        raise ValueError("Invalid cursor")
+    return timestamp, pk
+
+
+def collect_changes(user, cursor=None):
+    """
+    Returns the accounts, categories, tags and transactions of ``user`` changed
+    since ``cursor``, the ids deleted since then, and the cursor of the next
+    call. Without a cursor, or with one older than the tombstone retention,
+    every object is returned and ``reset`` tells the client to drop its cache.
+
+    Transactions are read in ``(updated_at, id)`` order, at most
+    ``SYNC_PAGE_SIZE`` at a time; ``has_more`` is set while there are further pages.
+    """
+    until = timezone.now()
+    since, after_pk = decode_cursor(cursor) if cursor else (None, None)
+    reset = since is None or since < until - SYNC_RETENTION
+    if reset:
+        since, after_pk = None, None
+
+    window = Q(updated_at__lt=until)
+    if since is not None:
+        window &= Q(updated_at__gte=since)
+
+    transactions = Transaction.objects.filter(window, user=user)
+    if after_pk is not None:
+        transactions = transactions.exclude(updated_at=since, id__lte=after_pk)
+    transactions = list(
+        transactions.select_related("installment_plan")
+        .prefetch_related("tags")
+        .order_by("updated_at", "id")[: SYNC_PAGE_SIZE + 1]
+    )
+    has_more = len(transactions) > SYNC_PAGE_SIZE
+    transactions = transactions[:SYNC_PAGE_SIZE]
+
+    deleted = defaultdict(list)
+    if since is not None:
+        tombstones = Tombstone.objects.filter(
+            user=user, created_at__gte=since, created_at__lt=until
+        ).values_list("kind", "object_id")
+        for kind, object_id in tombstones:
+            deleted[kind].append(object_id)
+
+    if has_more:
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.updated_at, last.pk)
+    elif since is None:
+        next_cursor = encode_cursor(until - SYNC_OVERLAP)
+    else:
+        next_cursor = encode_cursor(max(since, until - SYNC_OVERLAP))
+
+    return {
+        "cursor": next_cursor,
+        "has_more": has_more,
+        "reset": reset,
+        "accounts": Account.objects.filter(window, user=user),
+        "categories": Category.objects.filter(window, user=user),
+        "tags": Tag.objects.filter(window, user=user),
+        "transactions": transactions,
+        "deleted": {
+            "accounts": deleted[Tombstone.Kind.ACCOUNT],
+            "categories": deleted[Tombstone.Kind.CATEGORY],
+            "tags": deleted[Tombstone.Kind.TAG],
+            "transactions": deleted[Tombstone.Kind.TRANSACTION],
+        },
+    }
+
+
+def purge_tombstones(now=None):
+    """
+    Deletes the tombstones older than the retention window.
+    """
+    now = now or timezone.now()
+    deleted, _ = Tombstone.objects.filter(created_at__lt=now - SYNC_RETENTION).delete()
+    return deleted
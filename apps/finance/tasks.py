@@ -0,0 +1,61 @@
+from celery import shared_task
+
+from apps.core.tasks import BaseTaskWithRetry
+from apps.finance.importers import TransactionImporter
+from apps.finance.models import ImportJob, MonthlyRollup, Transaction
+from apps.finance.services import recompute_payment_dates, rebuild_user_rollups
+from apps.finance.sync import purge_tombstones
+
+
+class ImportTask(BaseTaskWithRetry):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        ImportJob.objects.filter(pk=args[0]).update(
+            status=ImportJob.Status.FAILED, detail=str(exc)
+        )
+
+
+@shared_task(base=ImportTask)
+def import_transactions(job_id):
+    """
+    Imports the statement uploaded with an ImportJob. Safe to retry: the job
+    resumes after the last committed batch.
+    """
+    job = ImportJob.objects.select_related("user", "account").get(pk=job_id)
+    if job.status == ImportJob.Status.COMPLETED:
+        return job.created_count
+
+    TransactionImporter(job).run()
+    return job.created_count
+
+
+@shared_task(base=BaseTaskWithRetry)
+def rebuild_monthly_rollups(user_id=None):
+    """
+    Rebuilds the monthly rollups of one user, or of every user with
+    transactions or rollups when ``user_id`` is not given.
+    """
+    if user_id is not None:
+        return rebuild_user_rollups(user_id)
+
+    user_ids = set(
+        Transaction.objects.values_list("user_id", flat=True).distinct()
+    ) | set(MonthlyRollup.objects.values_list("user_id", flat=True).distinct())
+    return sum(rebuild_user_rollups(user_id) for user_id in sorted(user_ids))
+
+
+@shared_task(base=BaseTaskWithRetry)
+def recompute_account_payment_dates(account_id):
+    """
+    Recomputes the payment dates of an account after its statement settings
+    changed.
+    """
+    return recompute_payment_dates(account_id)
+
+
+@shared_task(base=BaseTaskWithRetry)
+def purge_sync_tombstones():
+    """
+    Deletes the sync tombstones past their retention. Meant to run daily from
+    celery beat.
+    """
+    return purge_tombstones()
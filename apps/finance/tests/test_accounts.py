@@ -1,10 +1,24 @@
+import datetime
+import threading
 from decimal import Decimal
 
 import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 
-from apps.finance.models import Account, Transaction
+from apps.finance.models import (
+    Account,
+    AccountBalance,
+    MonthlyRollup,
+    Tombstone,
+    Transaction,
+)
+from apps.finance.serializers import AccountSerializer
+from apps.finance.services import find_balance_mismatches
+from apps.finance.tasks import recompute_account_payment_dates
 from apps.users.models import CustomUser
 
 
@@ -54,3 +68,292 @@ class TestAccountViewSet:
 
         # Balance should be 100 - 30 = 70
         assert response.data["current_balance"] == Decimal("70.00")
+
+    def test_sparse_fieldset_skips_the_balance(self, api_client, user, account):
+        api_client.force_authenticate(user=user)
+        url = reverse("account-list")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"fields": "id,name,current_balance"})
+        assert response.status_code == 200
+        assert list(response.data[0]) == ["id", "name", "current_balance"]
+        assert '"balance"' in ctx.captured_queries[0]["sql"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"omit": "current_balance,user"})
+        assert response.status_code == 200
+        assert list(response.data[0]) == [
+            "id",
+            "name",
+            "type",
+            "currency",
+            "closing_day",
+            "due_day_offset",
+        ]
+        assert '"balance"' not in ctx.captured_queries[0]["sql"]
+
+        response = api_client.get(url, {"fields": "id,balance"})
+        assert response.status_code == 400
+        assert response.data["fields"] == "Unknown fields: balance."
+
+    def test_balance_follows_updates_and_deletes(self, api_client, user, account):
+        api_client.force_authenticate(user=user)
+        txn = Transaction.objects.create(
+            account=account,
+            description="Salary",
+            amount=100,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+        account.refresh_from_db()
+        assert account.balance == Decimal("100.00")
+
+        url = reverse("transaction-detail", args=[txn.id])
+        response = api_client.patch(url, {"type": "expense", "amount": "40.00"})
+        assert response.status_code == 200
+        account.refresh_from_db()
+        assert account.balance == Decimal("-40.00")
+
+        response = api_client.delete(url)
+        assert response.status_code == 204
+        account.refresh_from_db()
+        assert account.balance == Decimal("0.00")
+
+    def test_saving_a_stale_account_keeps_the_balance(self, user, account):
+        stale = Account.objects.get(pk=account.pk)
+        Transaction.objects.create(
+            account=account,
+            description="Salary",
+            amount=100,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+
+        serializer = AccountSerializer(stale, data={"name": "Renamed"}, partial=True)
+        assert serializer.is_valid()
+        serializer.save()
+        stale.save(update_fields=["balance", "closing_day"])
+
+        account.refresh_from_db()
+        assert account.name == "Renamed"
+        assert account.balance == Decimal("100.00")
+
+    def test_deleting_a_transaction_twice_posts_it_once(self, user, account):
+        Transaction.objects.create(
+            account=account,
+            description="Salary",
+            amount=5,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+        txn = Transaction.objects.create(
+            account=account,
+            description="Rent",
+            amount=10,
+            type="income",
+            transaction_date="2023-01-02",
+        )
+        first, second = (Transaction.objects.get(pk=txn.pk) for _ in range(2))
+
+        first.delete()
+        assert second.delete()[0] == 0
+
+        account.refresh_from_db()
+        assert account.balance == Decimal("5.00")
+        accounts = Account.objects.filter(pk=account.pk)
+        assert find_balance_mismatches(accounts) == []
+        rollup = MonthlyRollup.objects.get(account=account)
+        assert (rollup.total, rollup.count) == (Decimal("5.00"), 1)
+        assert Tombstone.objects.filter(object_id=txn.pk).count() == 1
+
+    def test_stale_transaction_saves_post_each_change_once(self, user, account):
+        txn = Transaction.objects.create(
+            account=account,
+            description="Salary",
+            amount=100,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+        first, second = (Transaction.objects.get(pk=txn.pk) for _ in range(2))
+
+        first.amount = Decimal("40.00")
+        first.save()
+        second.amount = Decimal("40.00")
+        second.description = "Payroll"
+        second.save()
+
+        account.refresh_from_db()
+        assert account.balance == Decimal("40.00")
+        assert find_balance_mismatches(Account.objects.filter(pk=account.pk)) == []
+        rollup = MonthlyRollup.objects.get(account=account)
+        assert (rollup.total, rollup.count) == (Decimal("40.00"), 1)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_stale_transaction_saves(self, user, account):
+        txn = Transaction.objects.create(
+            account=account,
+            description="Salary",
+            amount=100,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+        loaded = threading.Barrier(2)
+
+        def update(amount):
+            try:
+                stale = Transaction.objects.get(pk=txn.pk)
+                loaded.wait(timeout=5)
+                stale.amount = Decimal(amount)
+                stale.save()
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=update, args=(amount,)) for amount in ("40", "70")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        txn.refresh_from_db()
+        account.refresh_from_db()
+        assert account.balance == txn.amount.amount
+        assert find_balance_mismatches(Account.objects.filter(pk=account.pk)) == []
+
+    def test_balance_moves_between_accounts(self, user, account):
+        other = Account.objects.create(user=user, name="Other", type="CASH")
+        txn = Transaction.objects.create(
+            account=account,
+            description="Cash",
+            amount=25,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+
+        txn.account = other
+        txn.save()
+
+        account.refresh_from_db()
+        other.refresh_from_db()
+        assert account.balance == Decimal("0.00")
+        assert other.balance == Decimal("25.00")
+
+    def test_per_currency_balances(self, user, account):
+        Transaction.objects.create(
+            account=account,
+            description="Dollars",
+            amount=100,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+        Transaction.objects.create(
+            account=account,
+            description="Euros",
+            amount=30,
+            amount_currency="EUR",
+            type="expense",
+            transaction_date="2023-01-02",
+        )
+
+        balances = dict(account.balances.values_list("currency", "amount"))
+        assert balances == {"EUR": Decimal("-30.00"), "USD": Decimal("100.00")}
+
+    def test_list_query_count_is_constant(
+        self, api_client, user, django_assert_max_num_queries
+    ):
+        api_client.force_authenticate(user=user)
+        for i in range(5):
+            account = Account.objects.create(
+                user=user, name=f"Account {i}", type="CASH"
+            )
+            Transaction.objects.create(
+                account=account,
+                description="Income",
+                amount=10,
+                type="income",
+                transaction_date="2023-01-01",
+            )
+
+        with django_assert_max_num_queries(1):
+            response = api_client.get(reverse("account-list"))
+
+        assert response.status_code == 200
+        assert [a["current_balance"] for a in response.data] == [Decimal("10.00")] * 5
+
+    def test_rebuild_balances_command(self, user, account):
+        Transaction.objects.create(
+            account=account,
+            description="Income",
+            amount=100,
+            type="income",
+            transaction_date="2023-01-01",
+        )
+        Account.objects.filter(pk=account.pk).update(balance=0)
+        AccountBalance.objects.filter(account=account).delete()
+
+        with pytest.raises(CommandError):
+            call_command("rebuild_balances", "--verify")
+
+        call_command("rebuild_balances")
+        call_command("rebuild_balances", "--verify")
+
+        account.refresh_from_db()
+        assert account.balance == Decimal("100.00")
+        assert account.balances.get().amount == Decimal("100.00")
+
+    def test_statement_change_recomputes_payment_dates(
+        self, api_client, user, mocker, django_capture_on_commit_callbacks
+    ):
+        api_client.force_authenticate(user=user)
+        card = Account.objects.create(
+            user=user,
+            name="Card",
+            type=Account.AccountType.CREDIT_CARD,
+            closing_day=5,
+            due_day_offset=5,
+        )
+        for day in ("2023-01-03", "2023-01-10", "2023-01-20"):
+            api_client.post(
+                reverse("transaction-list"),
+                {
+                    "account": card.id,
+                    "description": "Charge",
+                    "amount": "10.00",
+                    "amount_currency": "USD",
+                    "transaction_date": day,
+                    "type": "expense",
+                },
+            )
+        delay = mocker.patch("apps.finance.views.recompute_account_payment_dates.delay")
+
+        url = reverse("account-detail", args=[card.id])
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(url, {"name": "Visa"})
+        delay.assert_not_called()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.patch(url, {"closing_day": 15})
+        assert response.status_code == 200
+        delay.assert_called_once_with(card.id)
+
+        assert recompute_account_payment_dates(card.id) == 3
+        assert list(
+            card.transactions.order_by("transaction_date").values_list(
+                "payment_date", flat=True
+            )
+        ) == [
+            datetime.date(2023, 2, 20),
+            datetime.date(2023, 2, 20),
+            datetime.date(2023, 3, 20),
+        ]
+        assert dict(
+            MonthlyRollup.objects.filter(account=card, count__gt=0).values_list(
+                "month", "count"
+            )
+        ) == {datetime.date(2023, 2, 1): 2, datetime.date(2023, 3, 1): 1}
+
+        card.type = Account.AccountType.CHECKING
+        card.save()
+        assert recompute_account_payment_dates(card.id) == 3
+        assert recompute_account_payment_dates(card.id) == 0
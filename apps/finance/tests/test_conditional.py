@@ -0,0 +1,142 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework.test import APIClient
+
+from apps.core.etags import versions_key
+from apps.finance.models import Account, Category, Transaction
+from apps.finance.services import recompute_payment_dates
+from apps.users.models import CustomUser
+
+LIST_URLS = ("account-list", "category-list", "tag-list", "transaction-list")
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.fixture
+    def user(self):
+        user = CustomUser.objects.create_user(
+            email="test@example.com", password="password"
+        )
+        # Ids come back in a new test database, their versions would not.
+        get_redis_connection("default").delete(versions_key(user.pk))
+        return user
+
+    @pytest.fixture
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def account(self, user):
+        return Account.objects.create(
+            user=user,
+            name="Card",
+            type=Account.AccountType.CREDIT_CARD,
+            closing_day=5,
+            due_day_offset=5,
+        )
+
+    def etags(self, api_client):
+        etags = {}
+        for name in LIST_URLS:
+            response = api_client.get(reverse(name))
+            assert response.status_code == 200
+            etags[name] = response["ETag"]
+        return etags
+
+    def test_unchanged_list_is_not_modified(self, api_client, account):
+        url = reverse("transaction-list")
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"')
+        assert "private" in response["Cache-Control"]
+        assert "no-cache" in response["Cache-Control"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified["ETag"] == response["ETag"]
+        assert ctx.captured_queries == []
+
+        # Each query string and user has its own representation.
+        sparse = api_client.get(url, {"fields": "id"})
+        assert sparse["ETag"] != response["ETag"]
+
+        other = APIClient()
+        other.force_authenticate(
+            CustomUser.objects.create_user(email="other@example.com", password="pw")
+        )
+        assert other.get(url)["ETag"] != response["ETag"]
+
+    def test_writes_change_the_etags(
+        self, api_client, account, django_capture_on_commit_callbacks
+    ):
+        before = self.etags(api_client)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                reverse("transaction-list"),
+                {
+                    "account": account.id,
+                    "description": "Charge",
+                    "amount": "10.00",
+                    "amount_currency": "USD",
+                    "transaction_date": "2023-01-03",
+                    "type": "expense",
+                },
+            )
+        assert response.status_code == 201
+        after = self.etags(api_client)
+        assert after["transaction-list"] != before["transaction-list"]
+        assert after["account-list"] != before["account-list"]
+        assert after["category-list"] == before["category-list"]
+        assert after["tag-list"] == before["tag-list"]
+
+        # Failed writes change nothing.
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(reverse("category-list"), {})
+        assert response.status_code == 400
+        assert self.etags(api_client) == after
+
+        category = Category.objects.create(user=account.user, name="Fees")
+        Transaction.objects.filter(account=account).update(category=category)
+        before = after
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.delete(reverse("category-detail", args=[category.id]))
+        assert response.status_code == 204
+        after = self.etags(api_client)
+        assert after["category-list"] != before["category-list"]
+        assert after["transaction-list"] != before["transaction-list"]
+        assert after["tag-list"] == before["tag-list"]
+
+    def test_background_writes_change_the_etags(
+        self, api_client, account, django_capture_on_commit_callbacks
+    ):
+        Transaction.objects.create(
+            account=account,
+            description="Charge",
+            amount=10,
+            type="expense",
+            transaction_date="2023-01-10",
+        )
+        before = self.etags(api_client)
+
+        Account.objects.filter(pk=account.pk).update(closing_day=15)
+        with django_capture_on_commit_callbacks(execute=True):
+            assert recompute_payment_dates(account.id) == 1
+        assert self.etags(api_client)["transaction-list"] != (
+            before["transaction-list"]
+        )
+
+    def test_lost_versions_never_repeat(self, api_client, user, account):
+        url = reverse("account-list")
+        etag = api_client.get(url)["ETag"]
+
+        get_redis_connection("default").delete(versions_key(user.pk))
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
@@ -0,0 +1,181 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.finance.importers import TransactionImporter
+from apps.finance.models import Account, Category, ImportJob, Tag, Transaction
+from apps.finance.tasks import import_transactions
+from apps.users.models import CustomUser
+
+CSV_STATEMENT = b"""date,description,amount,account,category,tags
+2023-01-05,Salary,2500.00,Checking,Income,
+2023-01-06,Groceries,-120.50,Checking,Food,home|weekly
+2023-01-07,Laptop,-1200,Card,Tech,home
+2023-13-01,Bad date,-1,Checking,,
+2023-01-08,Ghost,-1,Unknown,,
+"""
+
+OFX_STATEMENT = b"""OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20230110120000<TRNAMT>-42.10<NAME>Coffee shop
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20230111
+<TRNAMT>100.00
+<MEMO>Refund
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+@pytest.mark.django_db
+class TestTransactionImport:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    @pytest.fixture
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def user(self):
+        return CustomUser.objects.create_user(
+            email="test@example.com", password="password"
+        )
+
+    @pytest.fixture
+    def checking(self, user):
+        return Account.objects.create(
+            user=user, name="Checking", type=Account.AccountType.CHECKING
+        )
+
+    @pytest.fixture
+    def card(self, user):
+        return Account.objects.create(
+            user=user,
+            name="Card",
+            type=Account.AccountType.CREDIT_CARD,
+            closing_day=5,
+            due_day_offset=5,
+        )
+
+    def make_job(self, user, content, file_format="csv", account=None):
+        job = ImportJob(user=user, account=account, file_format=file_format)
+        job.file.save(f"statement.{file_format}", ContentFile(content))
+        return job
+
+    def test_upload_enqueues_import(
+        self, api_client, checking, mocker, django_capture_on_commit_callbacks
+    ):
+        delay = mocker.patch("apps.finance.views.import_transactions.delay")
+        upload = SimpleUploadedFile("statement.csv", CSV_STATEMENT)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                reverse("import-list"),
+                {"file": upload, "account": checking.id},
+                format="multipart",
+            )
+
+        assert response.status_code == 201
+        assert response.data["file_format"] == "csv"
+        assert response.data["status"] == "pending"
+        delay.assert_called_once_with(response.data["id"])
+
+    def test_upload_rejects_unknown_format(self, api_client):
+        upload = SimpleUploadedFile("statement.pdf", b"%PDF")
+        response = api_client.post(
+            reverse("import-list"), {"file": upload}, format="multipart"
+        )
+        assert response.status_code == 400
+        assert "file_format" in response.data
+
+    def test_import_csv(self, api_client, user, checking, card):
+        job = self.make_job(user, CSV_STATEMENT)
+
+        import_transactions(job.id)
+
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.COMPLETED
+        assert job.processed_rows == 5
+        assert job.created_count == 3
+        assert job.error_count == 2
+        assert [error["line"] for error in job.errors] == [5, 6]
+
+        groceries = Transaction.objects.get(description="Groceries")
+        assert groceries.type == "expense"
+        assert groceries.amount.amount == Decimal("120.50")
+        assert groceries.category.name == "Food"
+        assert sorted(groceries.tags.values_list("name", flat=True)) == [
+            "home",
+            "weekly",
+        ]
+        assert Tag.objects.filter(user=user).count() == 2
+        assert Category.objects.filter(user=user).count() == 3
+
+        laptop = Transaction.objects.get(description="Laptop")
+        assert laptop.payment_date == datetime.date(2023, 3, 10)
+
+        checking.refresh_from_db()
+        assert checking.balance == Decimal("2379.50")
+
+        response = api_client.get(reverse("import-detail", args=[job.id]))
+        assert response.status_code == 200
+        assert response.data["created_count"] == 3
+
+    def test_invalid_currency_is_a_row_error(self, user, checking):
+        content = (
+            b"date,description,amount,currency\n"
+            b"2023-01-05,Salary,2500.00,USD\n"
+            b"2023-01-06,Lunch,-12.00,ZZZ\n"
+            b"2023-01-07,Taxi,-8.00,EUROS\n"
+            b"2023-01-08,Book,-20.00,\n"
+        )
+        job = self.make_job(user, content, account=checking)
+
+        import_transactions(job.id)
+
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.COMPLETED
+        assert job.created_count == 2
+        assert job.errors == [
+            {"line": 3, "error": "Invalid currency: 'ZZZ'."},
+            {"line": 4, "error": "Invalid currency: 'EUROS'."},
+        ]
+        assert set(Transaction.objects.values_list("description", flat=True)) == {
+            "Salary",
+            "Book",
+        }
+
+    def test_import_resumes_after_committed_batches(self, user, checking, card):
+        job = self.make_job(user, CSV_STATEMENT)
+        job.processed_rows = 2
+        job.save()
+
+        TransactionImporter(job, batch_size=2).run()
+
+        assert not Transaction.objects.filter(description="Salary").exists()
+        assert Transaction.objects.filter(description="Laptop").exists()
+        assert job.processed_rows == 5
+
+    def test_import_ofx(self, user, checking):
+        job = self.make_job(user, OFX_STATEMENT, "ofx", account=checking)
+
+        import_transactions(job.id)
+
+        job.refresh_from_db()
+        assert job.created_count == 2
+        coffee = Transaction.objects.get(description="Coffee shop")
+        assert coffee.type == "expense"
+        assert coffee.transaction_date == datetime.date(2023, 1, 10)
+        refund = Transaction.objects.get(description="Refund")
+        assert refund.type == "income"
@@ -0,0 +1,136 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.finance.models import Account, Category, Tag, Transaction
+from apps.users.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestTransactionCursorPagination:
+    @pytest.fixture
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def user(self):
+        return CustomUser.objects.create_user(
+            email="test@example.com", password="password"
+        )
+
+    @pytest.fixture
+    def account(self, user):
+        return Account.objects.create(
+            user=user,
+            name="Test Account",
+            type=Account.AccountType.CHECKING,
+            currency="USD",
+        )
+
+    @pytest.fixture
+    def category(self, user):
+        return Category.objects.create(user=user, name="Groceries")
+
+    @pytest.fixture
+    def tag(self, user):
+        return Tag.objects.create(user=user, name="Vacation")
+
+    @pytest.fixture
+    def transactions(self, account, category, tag):
+        # Plenty of ties on payment_date and transaction_date, plus null
+        # payment dates, so every branch of the keyset condition is walked.
+        rows = []
+        for i in range(11):
+            rows.append(
+                Transaction.objects.create(
+                    account=account,
+                    category=category if i % 2 else None,
+                    description=f"Txn {i}",
+                    amount=10,
+                    type="expense" if i % 3 else "income",
+                    transaction_date=datetime.date(2023, 1, 1 + i % 2),
+                    payment_date=(None if i < 3 else datetime.date(2023, 2, 1 + i % 3)),
+                )
+            )
+            if i % 4:
+                rows[-1].tags.add(tag)
+        return rows
+
+    def walk(self, api_client, url):
+        ids = []
+        pages = 0
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == 200
+            ids.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+            pages += 1
+        return ids, pages
+
+    def test_walks_all_pages_in_order(self, api_client, transactions):
+        url = reverse("transaction-list") + "?page_size=2"
+        ids, pages = self.walk(api_client, url)
+
+        # Nulls first, then payment_date descending.
+        nulls = sorted(
+            transactions[:3], key=lambda t: (t.transaction_date, t.id), reverse=True
+        )
+        assert ids[:3] == [t.id for t in nulls]
+        assert len(ids) == len(set(ids)) == 11
+        assert pages == 6
+
+        dated = Transaction.objects.filter(id__in=ids[3:])
+        assert ids[3:] == list(
+            dated.order_by("-payment_date", "-transaction_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_previous_links_walk_back(self, api_client, transactions):
+        url = reverse("transaction-list") + "?page_size=3"
+        forward, _ = self.walk(api_client, url)
+
+        # Jump to the last page, then walk backwards.
+        last_page = api_client.get(url)
+        while last_page.data["next"]:
+            last_page = api_client.get(last_page.data["next"])
+
+        backward = [row["id"] for row in last_page.data["results"]]
+        url = last_page.data["previous"]
+        while url:
+            response = api_client.get(url)
+            backward = [row["id"] for row in response.data["results"]] + backward
+            url = response.data["previous"]
+
+        assert backward == forward
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            "type=expense",
+            "start_date=2023-02-02&end_date=2023-02-03",
+            "category={category}",
+            "account={account}",
+            "tags={tag}",
+        ],
+    )
+    def test_composes_with_filters(
+        self, api_client, transactions, account, category, tag, params
+    ):
+        params = params.format(category=category.id, account=account.id, tag=tag.id)
+        full = api_client.get(reverse("transaction-list") + f"?{params}&page_size=500")
+        expected = [row["id"] for row in full.data["results"]]
+
+        ids, _ = self.walk(
+            api_client, reverse("transaction-list") + f"?{params}&page_size=2"
+        )
+        assert ids == expected
+        assert expected
+
+    def test_invalid_cursor(self, api_client, transactions):
+        response = api_client.get(reverse("transaction-list") + "?cursor=garbage")
+        assert response.status_code == 404
@@ -0,0 +1,177 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.finance.models import Account, Category, MonthlyRollup, Transaction
+from apps.finance.tasks import rebuild_monthly_rollups
+from apps.users.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestMonthlyRollups:
+    @pytest.fixture
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def user(self):
+        return CustomUser.objects.create_user(
+            email="test@example.com", password="password"
+        )
+
+    @pytest.fixture
+    def account(self, user):
+        return Account.objects.create(
+            user=user,
+            name="Test Account",
+            type=Account.AccountType.CHECKING,
+            currency="USD",
+        )
+
+    @pytest.fixture
+    def food(self, user):
+        return Category.objects.create(user=user, name="Food")
+
+    def create(self, account, amount, day, category=None, kind="expense"):
+        return Transaction.objects.create(
+            account=account,
+            category=category,
+            description="Txn",
+            amount=amount,
+            type=kind,
+            transaction_date=day,
+            payment_date=day,
+        )
+
+    def snapshot(self, user):
+        return sorted(
+            MonthlyRollup.objects.filter(user=user, count__gt=0).values_list(
+                "account_id",
+                "category_id",
+                "type",
+                "currency",
+                "month",
+                "total",
+                "count",
+            ),
+            key=lambda row: (row[0], row[1] or 0, row[2], row[4]),
+        )
+
+    def test_rollups_follow_changes(self, user, account, food):
+        jan = datetime.date(2023, 1, 1)
+        feb = datetime.date(2023, 2, 1)
+        first = self.create(account, 10, "2023-01-05", food)
+        self.create(account, 15, "2023-01-20", food)
+        other = self.create(account, 100, "2023-01-10", kind="income")
+
+        assert self.snapshot(user) == [
+            (account.id, None, "income", "USD", jan, Decimal("100.00"), 1),
+            (account.id, food.id, "expense", "USD", jan, Decimal("25.00"), 2),
+        ]
+
+        first.payment_date = datetime.date(2023, 2, 3)
+        first.save()
+        other.delete()
+
+        assert self.snapshot(user) == [
+            (account.id, food.id, "expense", "USD", jan, Decimal("15.00"), 1),
+            (account.id, food.id, "expense", "USD", feb, Decimal("10.00"), 1),
+        ]
+
+    def test_rebuild_matches_incremental(self, api_client, user, account, food):
+        self.create(account, 10, "2023-01-05", food)
+        api_client.post(
+            reverse("transaction-list"),
+            {
+                "account": account.id,
+                "category": food.id,
+                "description": "Fridge",
+                "amount": "900.00",
+                "amount_currency": "USD",
+                "transaction_date": "2023-01-15",
+                "type": "expense",
+                "is_installment": True,
+                "total_installments": 3,
+            },
+        )
+        incremental = self.snapshot(user)
+
+        MonthlyRollup.objects.all().delete()
+        rebuild_monthly_rollups()
+
+        assert self.snapshot(user) == incremental
+        assert len(incremental) == 3
+
+    def test_monthly_report(self, api_client, user, account, food):
+        self.create(account, 10, "2023-01-05", food)
+        self.create(account, 20, "2023-01-06")
+        self.create(account, 30, "2023-02-07", food)
+        self.create(account, 500, "2023-02-01", kind="income")
+
+        url = reverse("monthly-report")
+        response = api_client.get(url + "?group_by=type&start_month=2023-01")
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "month": "2023-01",
+                "currency": "USD",
+                "type": "expense",
+                "total": "30.00",
+                "count": 2,
+            },
+            {
+                "month": "2023-02",
+                "currency": "USD",
+                "type": "expense",
+                "total": "30.00",
+                "count": 1,
+            },
+            {
+                "month": "2023-02",
+                "currency": "USD",
+                "type": "income",
+                "total": "500.00",
+                "count": 1,
+            },
+        ]
+
+        response = api_client.get(url + f"?category={food.id}&end_month=2023-01")
+        assert response.json() == [
+            {
+                "month": "2023-01",
+                "account": account.id,
+                "category": food.id,
+                "type": "expense",
+                "currency": "USD",
+                "total": "10.00",
+                "count": 1,
+            }
+        ]
+
+        response = api_client.get(url + "?group_by=payee")
+        assert response.status_code == 400
+
+    def test_category_delete_moves_rollups(self, api_client, user, account, food):
+        self.create(account, 10, "2023-01-05", food)
+        self.create(account, 20, "2023-01-06")
+        self.create(account, 30, "2023-02-07", food)
+
+        response = api_client.delete(reverse("category-detail", args=[food.id]))
+        assert response.status_code == 204
+
+        jan = datetime.date(2023, 1, 1)
+        feb = datetime.date(2023, 2, 1)
+        moved = self.snapshot(user)
+        assert moved == [
+            (account.id, None, "expense", "USD", jan, Decimal("30.00"), 2),
+            (account.id, None, "expense", "USD", feb, Decimal("30.00"), 1),
+        ]
+
+        MonthlyRollup.objects.all().delete()
+        rebuild_monthly_rollups()
+        assert self.snapshot(user) == moved
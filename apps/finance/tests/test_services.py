@@ -3,7 +3,7 @@ import datetime
 import pytest
 
 from apps.finance.models import Account
-from apps.finance.services import calculate_payment_date
+from apps.finance.services import calculate_payment_date, calculate_payment_dates
 
 
 @pytest.mark.django_db
@@ -59,3 +59,17 @@ class TestPaymentDateService:
 
         expected = datetime.date(2024, 3, 1)
         assert calculate_payment_date(txn_date, account) == expected
+
+    def test_batched_matches_scalar(self):
+        card = Account(
+            type=Account.AccountType.CREDIT_CARD, closing_day=20, due_day_offset=10
+        )
+        checking = Account(type=Account.AccountType.CHECKING)
+        start = datetime.date(2023, 11, 1)
+        dates = [start + datetime.timedelta(days=i) for i in range(0, 800, 3)]
+
+        for account in (card, checking):
+            assert calculate_payment_dates(dates, account) == [
+                calculate_payment_date(txn_date, account) for txn_date in dates
+            ]
+        assert calculate_payment_dates([], card) == []
@@ -0,0 +1,133 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.finance.models import Account, Category, Tag, Tombstone, Transaction
+from apps.finance.sync import SYNC_RETENTION, encode_cursor
+from apps.users.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestSync:
+    @pytest.fixture
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def user(self):
+        return CustomUser.objects.create_user(
+            email="test@example.com", password="password"
+        )
+
+    @pytest.fixture
+    def account(self, user):
+        return Account.objects.create(
+            user=user, name="Checking", type=Account.AccountType.CHECKING
+        )
+
+    @pytest.fixture
+    def food(self, user):
+        return Category.objects.create(user=user, name="Food")
+
+    def create(self, account, description, category=None):
+        return Transaction.objects.create(
+            account=account,
+            category=category,
+            description=description,
+            amount=10,
+            type="expense",
+            transaction_date="2023-01-05",
+        )
+
+    def sync(self, api_client, since=None):
+        url = reverse("sync")
+        if since:
+            url += f"?since={since}"
+        response = api_client.get(url)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_full_snapshot_then_delta(self, api_client, user, account, food):
+        other = CustomUser.objects.create_user(
+            email="other@example.com", password="password"
+        )
+        Tag.objects.create(user=other, name="Hidden")
+        rent = self.create(account, "Rent")
+        lunch = self.create(account, "Lunch", food)
+
+        data = self.sync(api_client)
+        assert data["reset"] is True
+        assert data["has_more"] is False
+        assert [row["id"] for row in data["accounts"]] == [account.id]
+        assert [row["id"] for row in data["categories"]] == [food.id]
+        assert data["tags"] == []
+        assert [row["description"] for row in data["transactions"]] == [
+            "Rent",
+            "Lunch",
+        ]
+
+        # Skip the overlap window so only the later changes come back.
+        since = encode_cursor(lunch.updated_at + datetime.timedelta(microseconds=1))
+        rent.description = "Rent (March)"
+        rent.save()
+        lunch_id = lunch.id
+        lunch.delete()
+
+        data = self.sync(api_client, since)
+        assert data["reset"] is False
+        assert [row["id"] for row in data["transactions"]] == [rent.id]
+        assert data["categories"] == []
+        assert data["deleted"]["transactions"] == [lunch_id]
+        # The balance update touched the account.
+        assert [row["id"] for row in data["accounts"]] == [account.id]
+
+    def test_transactions_are_paged(self, api_client, user, account, mocker):
+        mocker.patch("apps.finance.sync.SYNC_PAGE_SIZE", 2)
+        created = [self.create(account, f"Txn {i}") for i in range(5)]
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            data = self.sync(api_client, cursor)
+            seen += [row["id"] for row in data["transactions"]]
+            cursor = data["cursor"]
+        assert data["has_more"] is False
+        assert seen == [txn.id for txn in created]
+
+    def test_deletes_leave_tombstones(self, api_client, user, account, food):
+        tag = Tag.objects.create(user=user, name="Trip")
+        lunch = self.create(account, "Lunch", food)
+        lunch.tags.add(tag)
+        since = encode_cursor(lunch.updated_at + datetime.timedelta(microseconds=1))
+        food_id, tag_id, account_id = food.id, tag.id, account.id
+
+        food.delete()
+        tag.delete()
+        data = self.sync(api_client, since)
+        assert data["deleted"]["categories"] == [food_id]
+        assert data["deleted"]["tags"] == [tag_id]
+        # Dropping the category and the tag changed the transaction as well.
+        assert data["transactions"][0]["category"] is None
+        assert data["transactions"][0]["tags"] == []
+
+        account.delete()
+        data = self.sync(api_client, since)
+        assert data["deleted"]["accounts"] == [account_id]
+        assert data["deleted"]["transactions"] == [lunch.id]
+
+    def test_stale_or_invalid_cursor(self, api_client, user, account):
+        self.create(account, "Rent")
+        Tombstone.objects.record(user.id, Tombstone.Kind.TAG, [1])
+
+        stale = encode_cursor(datetime.datetime.now(datetime.UTC) - SYNC_RETENTION * 2)
+        data = self.sync(api_client, stale)
+        assert data["reset"] is True
+        assert len(data["transactions"]) == 1
+        assert data["deleted"]["tags"] == []
+
+        response = api_client.get(reverse("sync") + "?since=garbage")
+        assert response.status_code == 400
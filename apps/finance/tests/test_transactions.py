@@ -1,11 +1,17 @@
+import csv
 import datetime
+import io
+import json
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 
-from apps.finance.models import Account, InstallmentPlan, Transaction
+from apps.finance.models import Account, InstallmentPlan, Tag, Transaction
+from apps.finance.serializers import TransactionSerializer
 from apps.users.models import CustomUser
 
 
@@ -117,6 +123,183 @@ class TestTransactionViewSet:
         assert txns[0].transaction_date == datetime.date(2023, 1, 1)
         assert txns[1].transaction_date == datetime.date(2023, 2, 1)
 
+    def test_installment_query_count_is_constant(self, api_client, user, account):
+        api_client.force_authenticate(user=user)
+        url = reverse("transaction-list")
+        tags = [
+            Tag.objects.create(user=user, name=name).id
+            for name in ("home", "tech", "gift")
+        ]
+
+        def create_plan(total_installments):
+            data = {
+                "account": account.id,
+                "description": "Laptop",
+                "amount": "1200.00",
+                "amount_currency": "USD",
+                "transaction_date": "2023-01-31",
+                "type": "expense",
+                "is_installment": True,
+                "total_installments": total_installments,
+                "tags": tags,
+            }
+            with CaptureQueriesContext(connection) as ctx:
+                response = api_client.post(url, data)
+            assert response.status_code == 201
+            return len(ctx.captured_queries)
+
+        # The first plan also creates the per-currency balance row.
+        create_plan(2)
+        assert create_plan(12) == create_plan(48)
+
+        txns = Transaction.objects.filter(installment_plan__total_installments=48)
+        assert txns.count() == 48
+        assert all(txn.tags.count() == 3 for txn in txns)
+        assert txns.get(installment_number=2).transaction_date == datetime.date(
+            2023, 2, 28
+        )
+
+        account.refresh_from_db()
+        assert account.balance == Decimal("-3600.00")
+
+    def test_list_matches_serializer(self, api_client, user, account, target_account):
+        api_client.force_authenticate(user=user)
+        url = reverse("transaction-list")
+        tags = [
+            Tag.objects.create(user=user, name=name).id
+            for name in ("tech", "home", "gift")
+        ]
+        for data in (
+            {"is_installment": True, "total_installments": 3, "tags": tags},
+            {"is_transfer": True, "target_account_id": target_account.id},
+        ):
+            response = api_client.post(
+                url,
+                {
+                    "account": account.id,
+                    "description": "Txn",
+                    "amount": "100.00",
+                    "amount_currency": "USD",
+                    "transaction_date": "2023-01-31",
+                    "type": "expense",
+                    **data,
+                },
+            )
+            assert response.status_code == 201
+        Transaction.objects.create(
+            account=account,
+            description="Unpaid",
+            amount=Decimal("0.10"),
+            type="income",
+            transaction_date="2023-01-01",
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url)
+        assert response.status_code == 200
+        assert len(ctx.captured_queries) == 1
+
+        results = response.json()["results"]
+        transactions = Transaction.objects.in_bulk([row["id"] for row in results])
+        expected = [
+            TransactionSerializer(transactions[row["id"]]).data for row in results
+        ]
+        assert results == json.loads(json.dumps(expected))
+        assert len(results) == 6
+        assert results[0]["payment_date"] is None
+        assert results[-1]["tags"] == sorted(
+            tags, key=lambda pk: Tag.objects.get(pk=pk).name
+        )
+
+    def test_sparse_fieldset(self, api_client, user, account):
+        api_client.force_authenticate(user=user)
+        url = reverse("transaction-list")
+        response = api_client.post(
+            url,
+            {
+                "account": account.id,
+                "description": "Laptop",
+                "amount": "1200.00",
+                "amount_currency": "USD",
+                "transaction_date": "2023-01-31",
+                "type": "expense",
+                "is_installment": True,
+                "total_installments": 3,
+                "tags": [Tag.objects.create(user=user, name="tech").id],
+            },
+        )
+        assert response.status_code == 201
+        plan_id = response.data["installment_plan"]["id"]
+
+        fields = "id,description,amount,payment_date"
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"fields": fields, "page_size": 2})
+        assert response.status_code == 200
+        rows = response.json()["results"]
+        assert [list(row) for row in rows] == [fields.split(",")] * 2
+        assert rows[0]["amount"] == "400.00"
+        sql = ctx.captured_queries[0]["sql"]
+        assert "finance_installmentplan" not in sql
+        assert "finance_transaction_tags" not in sql
+        assert '"category_id"' not in sql
+
+        # The cursors still hold the keyset columns.
+        response = api_client.get(response.data["next"])
+        assert [list(row) for row in response.json()["results"]] == [fields.split(",")]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"omit": "tags", "expand": ""})
+        assert response.status_code == 200
+        row = response.json()["results"][0]
+        assert "tags" not in row
+        assert row["installment_plan"] == plan_id
+        assert "finance_installmentplan" not in ctx.captured_queries[0]["sql"]
+
+        response = api_client.get(url, {"fields": "id,installment_plan"})
+        assert response.json()["results"][0]["installment_plan"]["id"] == plan_id
+
+        detail_url = reverse("transaction-detail", args=[row["id"]])
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(detail_url, {"fields": "id,installment_plan"})
+        assert list(response.json()) == ["id", "installment_plan"]
+        assert response.json()["installment_plan"]["id"] == plan_id
+        assert '"description"' not in ctx.captured_queries[0]["sql"]
+
+        response = api_client.get(detail_url, {"fields": "id", "expand": "tags"})
+        assert response.status_code == 400
+        assert response.data["expand"] == "Unknown fields: tags."
+
+    def test_owner_is_denormalized(self, api_client, user, account, target_account):
+        api_client.force_authenticate(user=user)
+        other_user = CustomUser.objects.create_user(
+            email="other@example.com", password="password"
+        )
+        other_account = Account.objects.create(
+            user=other_user, name="Other", type=Account.AccountType.CASH
+        )
+        txn = Transaction.objects.create(
+            account=account,
+            description="Mine",
+            amount=10,
+            type="expense",
+            transaction_date="2023-01-01",
+        )
+        Transaction.objects.create(
+            account=other_account,
+            description="Theirs",
+            amount=10,
+            type="expense",
+            transaction_date="2023-01-01",
+        )
+        assert txn.user == user
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("transaction-list") + "?type=expense")
+
+        assert [row["id"] for row in response.data["results"]] == [txn.id]
+        listing = next(q["sql"] for q in ctx.captured_queries if "LIMIT" in q["sql"])
+        assert "finance_account" not in listing
+
     def test_delete_transfer(self, api_client, user, account, target_account):
         api_client.force_authenticate(user=user)
         # Create transfer first
@@ -144,3 +327,56 @@ class TestTransactionViewSet:
         assert response.status_code == 204
 
         assert Transaction.objects.count() == 0
+
+    def test_export_csv_honors_filters(self, api_client, user, account):
+        api_client.force_authenticate(user=user)
+        tag = Tag.objects.create(user=user, name="home")
+        for i, kind in enumerate(["income", "expense", "expense"]):
+            txn = Transaction.objects.create(
+                account=account,
+                description=f"Txn {i}",
+                amount=10 + i,
+                type=kind,
+                transaction_date="2023-01-01",
+            )
+            txn.tags.add(tag)
+
+        url = reverse("transaction-export") + "?type=expense"
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        assert response.streaming
+
+        content = b"".join(response.streaming_content).decode()
+        rows = sorted(
+            csv.DictReader(io.StringIO(content)), key=lambda row: row["description"]
+        )
+        assert [row["description"] for row in rows] == ["Txn 1", "Txn 2"]
+        assert rows[0]["amount"] == "11.00"
+        assert rows[0]["tag_ids"] == str(tag.id)
+
+    def test_export_ndjson(self, api_client, user, account):
+        api_client.force_authenticate(user=user)
+        Transaction.objects.create(
+            account=account,
+            description="Coffee",
+            amount=3,
+            type="expense",
+            transaction_date="2023-01-01",
+        )
+
+        response = api_client.get(reverse("transaction-export") + "?file_format=ndjson")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+        row = json.loads(lines[0])
+        assert row["description"] == "Coffee"
+        assert row["amount"] == "3.00"
+        assert row["tag_ids"] == []
+
+    def test_export_invalid_format(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse("transaction-export") + "?file_format=xml")
+        assert response.status_code == 400
@@ -5,6 +5,9 @@ from apps.finance.views import (
     AccountViewSet,
     CategoryViewSet,
     TagViewSet,
+    ImportJobViewSet,
+    MonthlyReportView,
+    SyncView,
 )
 
 router = DefaultRouter()
@@ -12,7 +15,10 @@ router.register(r"transactions", TransactionViewSet, basename="transaction")
 router.register(r"accounts", AccountViewSet, basename="account")
 router.register(r"categories", CategoryViewSet, basename="category")
 router.register(r"tags", TagViewSet, basename="tag")
+router.register(r"imports", ImportJobViewSet, basename="import")
 
 urlpatterns = [
+    path("reports/monthly/", MonthlyReportView.as_view(), name="monthly-report"),
+    path("sync/", SyncView.as_view(), name="sync"),
     path("", include(router.urls)),
 ]
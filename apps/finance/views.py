@@ -1,28 +1,55 @@
-from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
-
-from apps.finance.filters import TransactionFilter
-from apps.finance.models import Account, Category, Tag, Transaction
+from django.db import transaction
+from django.db.models import Sum
+from django_filters.rest_framework import DjangoFilterBackend
+from django.http import StreamingHttpResponse
+from rest_framework import generics, mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+
+from apps.core.etags import ConditionalGetMixin
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.replicas import ReplicaReadMixin
+from apps.finance.exports import EXPORT_FORMATS, export_rows
+from apps.finance.filters import MonthlyRollupFilter, TransactionFilter
+from apps.finance.listing import list_fields, list_rows, to_representation
+from apps.finance.models import (
+    Account,
+    Category,
+    ImportJob,
+    MonthlyRollup,
+    Tag,
+    Transaction,
+)
+from apps.finance.pagination import TransactionCursorPagination
 from apps.finance.serializers import (
+    MONTHLY_REPORT_DIMENSIONS,
     AccountSerializer,
     CategorySerializer,
+    ImportJobSerializer,
+    MonthlyReportSerializer,
+    SyncSerializer,
     TagSerializer,
     TransactionSerializer,
 )
-from apps.finance.schema import (
-    AccountExamples,
-    CategoryExamples,
-    TagExamples,
-    TransactionExamples,
+from apps.finance.sync import collect_changes
+from apps.finance.tasks import (
+    import_transactions,
+    recompute_account_payment_dates,
 )
 
 
-@extend_schema(
-    tags=["Finance"],
-    examples=[AccountExamples.CREATE_REQUEST, AccountExamples.RESPONSE],
-)
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(
+    ConditionalGetMixin, SparseFieldsetMixin, ReplicaReadMixin, viewsets.ModelViewSet
+):
     serializer_class = AccountSerializer
+    # Balances move with the transactions, which go with a deleted account.
+    versioned_resources = ("accounts", "transactions")
+    written_resources = ("accounts", "transactions")
+
+    # Fields calculate_payment_date() depends on.
+    PAYMENT_DATE_FIELDS = ("type", "closing_day", "due_day_offset")
 
     def get_queryset(self):
         return Account.objects.filter(user=self.request.user)
@@ -30,13 +57,28 @@ class AccountViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def perform_update(self, serializer):
+        def settings(account):
+            return [getattr(account, field) for field in self.PAYMENT_DATE_FIELDS]
 
-@extend_schema(
-    tags=["Finance"],
-    examples=[CategoryExamples.CREATE_REQUEST, CategoryExamples.RESPONSE],
-)
-class CategoryViewSet(viewsets.ModelViewSet):
+        previous = settings(serializer.instance)
+        account = serializer.save()
+        if settings(account) != previous:
+            transaction.on_commit(
+                lambda: recompute_account_payment_dates.delay(account.id)
+            )
+
+
+class CategoryViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = CategorySerializer
+    versioned_resources = ("categories",)
+    written_resources = ("categories",)
+
+    def get_written_resources(self):
+        # Deleting a category uncategorizes its transactions.
+        if self.request.method == "DELETE":
+            return (*self.written_resources, "transactions")
+        return self.written_resources
 
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user)
@@ -45,12 +87,16 @@ class CategoryViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-@extend_schema(
-    tags=["Finance"],
-    examples=[TagExamples.CREATE_REQUEST, TagExamples.RESPONSE],
-)
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = TagSerializer
+    versioned_resources = ("tags",)
+    written_resources = ("tags",)
+
+    def get_written_resources(self):
+        # Deleting a tag removes it from its transactions.
+        if self.request.method == "DELETE":
+            return (*self.written_resources, "transactions")
+        return self.written_resources
 
     def get_queryset(self):
         return Tag.objects.filter(user=self.request.user)
@@ -59,21 +105,128 @@ class TagViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-@extend_schema(
-    tags=["Finance"],
-    examples=[
-        TransactionExamples.STANDARD_REQUEST,
-        TransactionExamples.TRANSFER_REQUEST,
-        TransactionExamples.INSTALLMENT_REQUEST,
-        TransactionExamples.RESPONSE,
-    ],
-)
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(
+    ConditionalGetMixin, SparseFieldsetMixin, ReplicaReadMixin, viewsets.ModelViewSet
+):
     serializer_class = TransactionSerializer
+    versioned_resources = ("transactions",)
+    # Every transaction write moves its account balance.
+    written_resources = ("transactions", "accounts")
     filterset_class = TransactionFilter
+    pagination_class = TransactionCursorPagination
 
     def get_queryset(self):
-        return Transaction.objects.filter(account__user=self.request.user)
+        return Transaction.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
         serializer.save()
+
+    def list(self, request, *args, **kwargs):
+        # Reads plain rows instead of running TransactionSerializer per row,
+        # see apps.finance.listing.
+        fields = list_fields(self.fieldset)
+        rows = list_rows(self.filter_queryset(self.get_queryset()), fields)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                [to_representation(row, fields) for row in page]
+            )
+        return Response([to_representation(row, fields) for row in rows])
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def export(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"file_format": f"Must be one of: {', '.join(EXPORT_FORMATS)}."}
+            )
+
+        content_type, stream = EXPORT_FORMATS[file_format]
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            stream(export_rows(queryset)), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="transactions.{file_format}"'
+        )
+        return response
+
+
+class ImportJobViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Uploads CSV/OFX statements and reports the progress of their import.
+    """
+
+    serializer_class = ImportJobSerializer
+    parser_classes = [MultiPartParser, FormParser]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        job = serializer.save(user=self.request.user)
+        transaction.on_commit(lambda: import_transactions.delay(job.id))
+
+
+class MonthlyReportView(ReplicaReadMixin, generics.ListAPIView):
+    serializer_class = MonthlyReportSerializer
+    filterset_class = MonthlyRollupFilter
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = None
+
+    def get_queryset(self):
+        return MonthlyRollup.objects.filter(user=self.request.user, count__gt=0)
+
+    def get_group_by(self):
+        value = self.request.query_params.get("group_by")
+        if value is None:
+            return list(MONTHLY_REPORT_DIMENSIONS)
+
+        group_by = [dimension.strip() for dimension in value.split(",")]
+        group_by = [dimension for dimension in group_by if dimension]
+        invalid = set(group_by) - set(MONTHLY_REPORT_DIMENSIONS)
+        if invalid:
+            raise ValidationError(
+                {"group_by": f"Unknown dimensions: {', '.join(sorted(invalid))}."}
+            )
+        return group_by
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["group_by"] = self.group_by
+        return context
+
+    def list(self, request, *args, **kwargs):
+        self.group_by = self.get_group_by()
+        columns = ["month", "currency"] + [
+            dimension if dimension == "type" else f"{dimension}_id"
+            for dimension in self.group_by
+        ]
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values(*columns)
+            .annotate(total_sum=Sum("total"), count_sum=Sum("count"))
+            .order_by(*columns)
+        )
+        serializer = self.get_serializer(rows, many=True)
+        return Response(serializer.data)
+
+
+class SyncView(generics.GenericAPIView):
+    serializer_class = SyncSerializer
+    pagination_class = None
+
+    def get(self, request, *args, **kwargs):
+        try:
+            changes = collect_changes(request.user, request.query_params.get("since"))
+        except ValueError as e:
+            raise ValidationError({"since": str(e)})
+
+        serializer = self.get_serializer(changes)
+        return Response(serializer.data)
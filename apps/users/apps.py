@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.users"
+
+    def ready(self):
+        from knox.models import get_token_model
+
+        from apps.users.authentication import (
+            invalidate_deactivated_user,
+            invalidate_deleted_token,
+        )
+        from apps.users.models import CustomUser
+
+        post_delete.connect(
+            invalidate_deleted_token,
+            sender=get_token_model(),
+            dispatch_uid="apps.users.invalidate_deleted_token",
+        )
+        post_save.connect(
+            invalidate_deactivated_user,
+            sender=CustomUser,
+            dispatch_uid="apps.users.invalidate_deactivated_user",
+        )
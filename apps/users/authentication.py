@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from knox.auth import TokenAuthentication
+from knox.crypto import hash_token
+from knox.models import get_token_model
+from knox.settings import knox_settings
+from rest_framework import exceptions
+
+from apps.users.models import CustomUser
+
+# Deleting a token drops the shared Redis entry right away, but the in-process
+# entries of other workers only age out, so keep their lifetime short.
+LOCAL_CACHE_TTL = 5
+LOCAL_CACHE_SIZE = 1024
+SHARED_CACHE_TTL = 300
+CACHE_KEY_PREFIX = "auth_token"
+
+
+class TokenLRU:
+    """
+    A small thread-safe LRU of verified tokens, keyed by the raw token string
+    so a hit costs neither a hash nor a network round trip.
+
+    Attributes:
+        maxsize (int): The number of tokens kept before evicting the oldest
+        ttl (int): The number of seconds an entry is trusted
+    """
+
+    def __init__(self, maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return value
+
+    def set(self, token, value):
+        with self._lock:
+            self._entries[token] = (time.monotonic(), value)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, digests):
+        digests = set(digests)
+        with self._lock:
+            for token, (_stored_at, value) in list(self._entries.items()):
+                if value["digest"] in digests:
+                    del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_tokens = TokenLRU()
+
+
+def token_cache_key(digest):
+    return f"{CACHE_KEY_PREFIX}:{digest}"
+
+
+def invalidate_tokens(digests):
+    """
+    Drops the given token digests from the shared cache and from the cache of
+    the current process.
+    """
+    digests = list(digests)
+    if not digests:
+        return
+    cache.delete_many([token_cache_key(digest) for digest in digests])
+    local_tokens.discard(digests)
+
+
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    ``post_delete`` receiver of the knox token model: logging out, admin
+    deletions and the expired token purge all end here. Runs on commit, a
+    request verifying the token until then would cache it again.
+    """
+    digest = instance.digest
+    transaction.on_commit(lambda: invalidate_tokens([digest]))
+
+
+def invalidate_deactivated_user(sender, instance, update_fields=None, **kwargs):
+    """
+    ``post_save`` receiver of the user model dropping the cached tokens of
+    deactivated users.
+    """
+    if instance.is_active or (
+        update_fields is not None and "is_active" not in update_fields
+    ):
+        return
+    digests = list(instance.auth_token_set.values_list("digest", flat=True))
+    transaction.on_commit(lambda: invalidate_tokens(digests))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Knox token authentication with a two-level cache of verified tokens.
+
+    A verified token is remembered as ``{digest, token_key, user_id, expiry}``
+    in a per-process LRU (keyed by the raw token) and in the default cache
+    (keyed by the digest). A hit skips the ``AuthToken`` lookup, knox's scan
+    of the other tokens of the user and, for local hits, the hash. It still
+    runs one query: the user is loaded by primary key rather than cached, so
+    deactivations take effect at once, even when made with ``update()``.
+
+    Misses, expired entries and ``AUTO_REFRESH`` setups fall back to knox.
+    Deleted tokens and deactivated users are dropped from the caches by the
+    receivers connected in ``UsersConfig.ready()``.
+    """
+
+    def authenticate_credentials(self, token):
+        if knox_settings.AUTO_REFRESH:
+            return super().authenticate_credentials(token)
+
+        raw = token.decode("utf-8")
+        entry = local_tokens.get(raw)
+        if entry is None:
+            entry = cache.get(token_cache_key(hash_token(raw)))
+            if entry is not None:
+                local_tokens.set(raw, entry)
+
+        now = timezone.now()
+        if entry is None or (entry["expiry"] is not None and entry["expiry"] <= now):
+            user, auth_token = super().authenticate_credentials(token)
+            self.remember(raw, auth_token)
+            return user, auth_token
+
+        try:
+            user = CustomUser.objects.get(pk=entry["user_id"])
+        except CustomUser.DoesNotExist:
+            invalidate_tokens([entry["digest"]])
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        auth_token = get_token_model()(
+            digest=entry["digest"],
+            token_key=entry["token_key"],
+            user=user,
+            expiry=entry["expiry"],
+        )
+        # Loaded from the cache, not from a query, but it does exist.
+        auth_token._state.adding = False
+        return self.validate_user(auth_token)
+
+    def remember(self, raw, auth_token):
+        entry = {
+            "digest": auth_token.digest,
+            "token_key": auth_token.token_key,
+            "user_id": auth_token.user_id,
+            "expiry": auth_token.expiry,
+        }
+        timeout = SHARED_CACHE_TTL
+        if auth_token.expiry is not None:
+            remaining = (auth_token.expiry - timezone.now()).total_seconds()
+            timeout = max(1, min(timeout, int(remaining)))
+
+        cache.set(token_cache_key(auth_token.digest), entry, timeout)
+        local_tokens.set(raw, entry)
@@ -1,4 +1,17 @@
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse
+"""
+OpenAPI documentation of the users views and authentication.
+
+Only imported by ``apps.core.schema.SchemaGenerator``, so serving requests
+never loads the examples nor drf-spectacular's schema machinery.
+"""
+
+from drf_spectacular.contrib.knox_auth_token import KnoxTokenScheme
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+)
 
 from apps.core.schema import UNAUTHORIZED_EXAMPLES, ErrorResponseSerializer
 
@@ -7,6 +20,7 @@ from .serializers import (
     LoginResponseSerializer,
     UserProfileSerializer,
 )
+from .views import CreateUserView, LoginView, UserProfileView
 
 LOGIN_RESPONSE_SCHEMA = {
     200: OpenApiResponse(
@@ -120,3 +134,18 @@ PROFILE_PATCH_SCHEMA = {
         examples=UNAUTHORIZED_EXAMPLES,
     ),
 }
+
+
+class CachedTokenScheme(KnoxTokenScheme):
+    target_class = "apps.users.authentication.CachedTokenAuthentication"
+
+
+extend_schema(responses=LOGIN_RESPONSE_SCHEMA)(LoginView)
+
+extend_schema_view(
+    get=extend_schema(responses=PROFILE_DETAIL_SCHEMA),
+    patch=extend_schema(responses=PROFILE_PATCH_SCHEMA),
+    put=extend_schema(responses=PROFILE_PUT_SCHEMA),
+)(UserProfileView)
+
+extend_schema(responses=USER_CREATE_RESPONSE_SCHEMA)(CreateUserView)
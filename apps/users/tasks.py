@@ -0,0 +1,53 @@
+import logging
+
+from celery import shared_task
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+from knox.models import get_token_model
+
+from apps.core.tasks import BaseTaskWithRetry
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 5000
+
+
+def delete_in_batches(queryset, batch_size=PURGE_BATCH_SIZE):
+    """
+    Deletes the rows of ``queryset`` at most ``batch_size`` at a time, so each
+    DELETE holds its locks briefly. Yields the running total after each batch.
+    """
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        queryset.model._base_manager.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        yield deleted
+        if len(pks) < batch_size:
+            return
+
+
+@shared_task(base=BaseTaskWithRetry, bind=True)
+def purge_expired_auth(self, batch_size=PURGE_BATCH_SIZE):
+    """
+    Deletes expired knox tokens and Django sessions in batches. Reports the
+    running totals as the PROGRESS state of the task and returns the final
+    counts.
+    """
+    now = timezone.now()
+    targets = {
+        "tokens": get_token_model().objects.filter(expiry__lt=now),
+        "sessions": Session.objects.filter(expire_date__lt=now),
+    }
+    progress = dict.fromkeys(targets, 0)
+
+    for name, queryset in targets.items():
+        for deleted in delete_in_batches(queryset, batch_size):
+            progress[name] = deleted
+            if self.request.id:
+                self.update_state(state="PROGRESS", meta=progress)
+            logger.info("Purged %d expired %s", deleted, name)
+
+    return progress
@@ -187,3 +187,17 @@ class LoginViewTests(APITestCase):
             profile_url = reverse("users:profile")
             response = self.client.get(profile_url)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_without_session(self):
+        """Test that token-only logins can skip the Django session"""
+        from django.contrib.sessions.models import Session
+
+        with patch("apps.users.views.LoginView.create_session", False):
+            response = self.client.post(self.url, self.valid_credentials, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+        self.assertFalse(Session.objects.exists())
+
+        response = self.client.post(self.url, self.valid_credentials, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Session.objects.exists())
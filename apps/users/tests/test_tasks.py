@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+from knox.models import AuthToken
+
+from apps.users.models import CustomUser as User
+from apps.users.tasks import purge_expired_auth
+
+
+class PurgeExpiredAuthTests(TestCase):
+    """Test suite for the expired token and session purge task"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="testuser@example.com", password="testpassword123"
+        )
+
+    def test_purges_only_expired_rows(self):
+        """Test that expired tokens and sessions are deleted in batches"""
+        for _ in range(5):
+            AuthToken.objects.create(user=self.user, expiry=timedelta(hours=-1))
+        live, _ = AuthToken.objects.create(user=self.user)
+        AuthToken.objects.create(user=self.user, expiry=None)
+
+        for _ in range(3):
+            SessionStore().create()
+        Session.objects.update(expire_date=timezone.now() - timedelta(days=1))
+        session = SessionStore()
+        session.create()
+
+        result = purge_expired_auth.apply(kwargs={"batch_size": 2}).get()
+
+        self.assertEqual(result, {"tokens": 5, "sessions": 3})
+        self.assertEqual(AuthToken.objects.count(), 2)
+        self.assertTrue(AuthToken.objects.filter(pk=live.pk).exists())
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)),
+            [session.session_key],
+        )
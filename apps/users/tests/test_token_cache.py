@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from knox.models import get_token_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.users.authentication import local_tokens
+from apps.users.models import CustomUser as User
+
+
+class TokenCacheTests(APITestCase):
+    """Test suite for the cached knox token authentication"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile_url = reverse("users:profile")
+        cls.user = User.objects.create_user(
+            email="testuser@example.com", password="testpassword123"
+        )
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+
+    def login(self):
+        response = self.client.post(
+            reverse("users:knox_login"),
+            {"email": "testuser@example.com", "password": "testpassword123"},
+            format="json",
+        )
+        # Authenticate with the token alone, not with the login session.
+        self.client.cookies.clear()
+        return response.data["token"]
+
+    def get_profile(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.profile_url)
+        token_queries = [q for q in queries if "knox_authtoken" in q["sql"]]
+        return response, token_queries
+
+    def test_cached_token_skips_token_queries(self):
+        """Test that only the first request looks the token up"""
+        token = self.login()
+
+        response, token_queries = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(token_queries), 2)
+
+        response, token_queries = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_queries, [])
+
+        # Another worker only finds it in the shared cache.
+        local_tokens.clear()
+        response, token_queries = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_queries, [])
+
+    def test_cached_token_of_inactive_user(self):
+        """Test that deactivated users are refused despite the cache"""
+        token = self.login()
+        self.get_profile(token)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response, _ = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_invalidates_token(self):
+        """Test that logging out drops the cached token"""
+        token = self.login()
+        other = self.login()
+        self.get_profile(token)
+        self.get_profile(other)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("users:knox_logout"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response, _ = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response, _ = self.get_profile(other)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_logoutall_invalidates_tokens(self):
+        """Test that logging out everywhere drops every cached token"""
+        tokens = [self.login(), self.login()]
+        for token in tokens:
+            self.get_profile(token)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[0]}")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("users:knox_logoutall"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        for token in tokens:
+            response, _ = self.get_profile(token)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_invalidated(self):
+        """Test that tokens deleted outside the logout views are dropped"""
+        token = self.login()
+        self.get_profile(token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            get_token_model().objects.filter(user=self.user).delete()
+        response, _ = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_purged_token_is_invalidated(self):
+        """Test that knox's purge of expired tokens drops them"""
+        token = self.login()
+        self.get_profile(token)
+
+        tokens = get_token_model().objects.filter(user=self.user)
+        tokens.update(expiry=timezone.now() - timedelta(seconds=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            get_token_model().objects.filter(expiry__lt=timezone.now()).delete()
+        self.assertIsNone(local_tokens.get(token))
+        response, _ = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_invalidated(self):
+        """Test that deactivating a user drops their cached tokens"""
+        token = self.login()
+        self.get_profile(token)
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertIsNone(local_tokens.get(token))
+        # Looked up by knox again, which refuses the user.
+        response, token_queries = self.get_profile(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(token_queries), 2)
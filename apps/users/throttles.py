@@ -1,12 +1,15 @@
 from rest_framework.throttling import SimpleRateThrottle
 
+from apps.core.throttling import AtomicThrottleMixin
 
-class UserLoginRateThrottle(SimpleRateThrottle):
+
+class UserLoginRateThrottle(AtomicThrottleMixin, SimpleRateThrottle):
     """
     A rate throttle class for user login attempts.
 
     This class extends SimpleRateThrottle to implement rate limiting for login requests.
-    It uses different identifiers for authenticated and unauthenticated users.
+    It uses different identifiers for authenticated and unauthenticated users, and
+    checks the limit with one atomic Redis script (see apps.core.throttling).
 
     Attributes:
         scope (str): The scope identifier for this throttle ("user_login")
@@ -1,8 +1,12 @@
 from django.urls import path
 
-from knox import views as knox_views
-
-from .views import CreateUserView, LoginView, UserProfileView
+from .views import (
+    CreateUserView,
+    LoginView,
+    LogoutAllView,
+    LogoutView,
+    UserProfileView,
+)
 
 app_name = "users"
 
@@ -10,6 +14,6 @@ urlpatterns = [
     path("create/", CreateUserView.as_view(), name="create"),
     path("profile/", UserProfileView.as_view(), name="profile"),
     path("login/", LoginView.as_view(), name="knox_login"),
-    path("logout/", knox_views.LogoutView.as_view(), name="knox_logout"),
-    path("logoutall/", knox_views.LogoutAllView.as_view(), name="knox_logoutall"),
+    path("logout/", LogoutView.as_view(), name="knox_logout"),
+    path("logoutall/", LogoutAllView.as_view(), name="knox_logoutall"),
 ]
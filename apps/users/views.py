@@ -1,19 +1,14 @@
 import logging
 
+from django.conf import settings
 from django.contrib.auth import login
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from knox.auth import TokenAuthentication
-from knox.views import LoginView as KnoxLoginView
-from rest_framework import generics, permissions, serializers, status, throttling
+from knox import views as knox_views
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.response import Response
 
-from .schema import (
-    LOGIN_RESPONSE_SCHEMA,
-    PROFILE_DETAIL_SCHEMA,
-    PROFILE_PATCH_SCHEMA,
-    PROFILE_PUT_SCHEMA,
-    USER_CREATE_RESPONSE_SCHEMA,
-)
+from apps.core.throttling import UserRateThrottle
+
+from .authentication import CachedTokenAuthentication
 from .serializers import (
     AuthTokenSerializer,
     CreateUserSerializer,
@@ -24,12 +19,12 @@ from .throttles import UserLoginRateThrottle
 security_logger = logging.getLogger("django.security")
 
 
-@extend_schema(responses=LOGIN_RESPONSE_SCHEMA)
-class LoginView(KnoxLoginView):
-    authentication_classes = (TokenAuthentication,)
+class LoginView(knox_views.LoginView):
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.AllowAny,)
     serializer_class = AuthTokenSerializer
     throttle_classes = [UserLoginRateThrottle]
+    create_session = settings.LOGIN_CREATE_SESSION
 
     def post(self, request, format=None) -> Response:
         serializer = AuthTokenSerializer(
@@ -37,7 +32,10 @@ class LoginView(KnoxLoginView):
         )
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
-        login(request, user)
+        if self.create_session:
+            login(request, user)
+        else:
+            request.user = user
         security_logger.info(f"User {user.email} logged in.")
         return super(LoginView, self).post(request, format=None)
 
@@ -47,25 +45,27 @@ class LoginView(KnoxLoginView):
         return context
 
 
-@extend_schema_view(
-    get=extend_schema(responses=PROFILE_DETAIL_SCHEMA),
-    patch=extend_schema(responses=PROFILE_PATCH_SCHEMA),
-    put=extend_schema(responses=PROFILE_PUT_SCHEMA),
-)
+class LogoutView(knox_views.LogoutView):
+    authentication_classes = (CachedTokenAuthentication,)
+
+
+class LogoutAllView(knox_views.LogoutAllView):
+    authentication_classes = (CachedTokenAuthentication,)
+
+
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = (permissions.IsAuthenticated,)
-    throttle_classes = [throttling.UserRateThrottle]
+    throttle_classes = [UserRateThrottle]
 
     def get_object(self):
         return self.request.user
 
 
-@extend_schema(responses=USER_CREATE_RESPONSE_SCHEMA)
 class CreateUserView(generics.CreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = CreateUserSerializer
-    throttle_classes = [throttling.UserRateThrottle]
+    throttle_classes = [UserRateThrottle]
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -0,0 +1,78 @@
+"""
+Gunicorn settings for production, used by ``scripts/server.py``.
+
+The app is preloaded: Django's app registry, models, URLconf and the view and
+serializer modules it imports are loaded once in the master and shared
+copy-on-write with the workers, which are recycled after ``max_requests``.
+Every setting can be tuned from the environment.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync"
+)
+
+preload_app = True
+# Restart workers after this many requests, jittered so they do not all
+# restart at once, to bound slow memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def when_ready(server):
+    # URL patterns are resolved on the first request, resolve them here so
+    # the workers inherit them.
+    from django.urls import get_resolver
+
+    get_resolver().reverse_dict
+
+
+def pre_fork(server, worker):
+    # Close the master's connections, so no worker inherits a socket whose
+    # session it would end for everyone by closing it.
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        # Pools are created lazily, close_pool() would open one first.
+        if connection.alias in getattr(connection, "_connection_pools", {}):
+            connection.close_pool()
+    caches.close_all()
+
+    # Keep what the master loaded out of the collector, whose bookkeeping
+    # writes would otherwise copy the shared pages into every worker.
+    gc.freeze()
+
+
+# Handles a worker found open after forking. Referenced for its lifetime so
+# their finalizers never send a Terminate on the master's sockets.
+inherited_handles = []
+
+
+def post_fork(server, worker):
+    # pre_fork() closed the master's connections, whatever is left is still
+    # the master's: forget it without closing it. Redis connection pools
+    # already reset themselves in a new process.
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            inherited_handles.append(connection.connection)
+            connection.connection = None
+        pools = getattr(connection, "_connection_pools", {})
+        inherited_handles.extend(pools.values())
+        pools.clear()
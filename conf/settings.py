@@ -60,12 +60,43 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = "DENY"
 CSRF_COOKIE_SECURE = not DEBUG
 SESSION_COOKIE_SECURE = not DEBUG
+# Whether logging in also opens a Django session. Token-only API clients can
+# turn it off to skip a django_session write per login.
+LOGIN_CREATE_SESSION = env.bool("LOGIN_CREATE_SESSION", default=True)
 
 # -----------------------------------------------------------------------------
 # Databases
 # -----------------------------------------------------------------------------
 DJANGO_DATABASE_URL = env.db("DATABASE_URL")
 DATABASES = {"default": DJANGO_DATABASE_URL}
+
+# Optional read replica for list and report endpoints, see apps.core.replicas.
+if env("REPLICA_DATABASE_URL", default=""):
+    DATABASES["replica"] = env.db("REPLICA_DATABASE_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["apps.core.replicas.ReplicaRouter"]
+# Seconds users read from the primary after writing, above the replica lag.
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=10)
+
+# Connections are reused for CONN_MAX_AGE seconds (0 closes them after each
+# request) and pinged before reuse. DATABASE_POOL checks them out of a psycopg
+# 3 pool instead (install the "pool" extra), which requires CONN_MAX_AGE=0.
+DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
+for database in DATABASES.values():
+    if database["ENGINE"] == "django.db.backends.postgresql":
+        # Times connection waits for the request metrics.
+        database["ENGINE"] = "apps.core.backends.postgresql"
+    database["CONN_MAX_AGE"] = (
+        0 if DATABASE_POOL else env.int("CONN_MAX_AGE", default=0)
+    )
+    database["CONN_HEALTH_CHECKS"] = env.bool("CONN_HEALTH_CHECKS", default=True)
+    if DATABASE_POOL:
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+            "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+        }
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
@@ -87,8 +118,6 @@ INSTALLED_APPS = [
     "knox",
     "django_celery_beat",
     "django_celery_results",
-    "drf_spectacular",
-    "django_extensions",
     "djmoney",
     # local apps
     "apps.users",
@@ -106,6 +135,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "apps.core.middleware.RequestIDMiddleware",
+    "apps.core.replicas.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -145,14 +175,15 @@ REST_KNOX = {
 }
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ("knox.auth.TokenAuthentication",),
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "apps.users.authentication.CachedTokenAuthentication",
+    ),
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
     "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_RATES": {
         "user": "1000/day",
         "anon": "100/day",
@@ -160,11 +191,42 @@ REST_FRAMEWORK = {
     },
 }
 
+# orjson and MessagePack codecs (install the "fast" extra), see
+# apps.core.renderers. Clients get MessagePack with Accept: application/msgpack.
+API_FAST_RENDERERS = env.bool("API_FAST_RENDERERS", default=False)
+if API_FAST_RENDERERS:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "apps.core.renderers.ORJSONRenderer",
+        "apps.core.renderers.MessagePackRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "apps.core.renderers.ORJSONParser",
+        "apps.core.renderers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
+# drf-spectacular is only loaded where the OpenAPI schema is generated: its
+# checks, extensions and AutoSchema would otherwise slow every process startup.
+API_SCHEMA = env.bool("API_SCHEMA", default=DEBUG)
+if API_SCHEMA:
+    INSTALLED_APPS += ["drf_spectacular"]
+    REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"] = "drf_spectacular.openapi.AutoSchema"
+
+# Schema prebuilt by `manage.py build_schema`, served in every environment at
+# /core/schema.json. In the static files dir, collectstatic also publishes a
+# content-hashed copy cached as immutable, which the endpoint redirects to.
+# API_SCHEMA_MAX_AGE only applies when the file is served without that copy.
+API_SCHEMA_FILE = env("API_SCHEMA_FILE", default=root_path("static", "openapi.json"))
+API_SCHEMA_MAX_AGE = env.int("API_SCHEMA_MAX_AGE", default=3600)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Noodle API",
     "DESCRIPTION": "Next generation Budgeting App API",
     "VERSION": "0.0.1",
     "SERVE_INCLUDE_SCHEMA": False,
+    # Loads the schema modules of the apps, see apps.core.schema.
+    "DEFAULT_GENERATOR_CLASS": "apps.core.schema.SchemaGenerator",
 }
 
 if DEBUG:
@@ -186,7 +248,7 @@ if not CORS_ALLOW_ALL_ORIGINS:
 # -----------------------------------------------------------------------------
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "apps.core.cache.InstrumentedRedisCache",
         "LOCATION": env("REDIS_URL", default="redis://redis:6379"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -196,6 +258,10 @@ CACHES = {
 
 USER_AGENTS_CACHE = "default"
 
+# Lifetime of the per-user resource versions behind the API ETags, renewed on
+# every read and write, see apps.core.etags.
+ETAG_VERSIONS_TTL = env.int("ETAG_VERSIONS_TTL", default=30 * 24 * 3600)
+
 # -----------------------------------------------------------------------------
 # Celery
 # -----------------------------------------------------------------------------
@@ -207,6 +273,17 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Santiago"
 CELERY_RESULT_EXTENDED = True
+# Synced into the django_celery_beat tables when beat starts.
+CELERY_BEAT_SCHEDULE = {
+    "purge-expired-auth": {
+        "task": "apps.users.tasks.purge_expired_auth",
+        "schedule": timedelta(hours=1),
+    },
+    "purge-sync-tombstones": {
+        "task": "apps.finance.tasks.purge_sync_tombstones",
+        "schedule": timedelta(days=1),
+    },
+}
 
 # -----------------------------------------------------------------------------
 # Email
@@ -220,6 +297,17 @@ EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
 # -----------------------------------------------------------------------------
 # Sentry and logging
 # -----------------------------------------------------------------------------
+# Requests running more SQL queries than this are logged as warnings.
+REQUEST_QUERY_BUDGET = env.int("REQUEST_QUERY_BUDGET", default=50)
+
+# Queue file log records for one writer thread per process, see
+# apps.core.logqueue. The policy is "drop" or "block" (up to the timeout).
+# The log files are then rotated externally, e.g. by logrotate.
+LOG_QUEUE = env.bool("LOG_QUEUE", default=False)
+LOG_QUEUE_SIZE = env.int("LOG_QUEUE_SIZE", default=10000)
+LOG_QUEUE_POLICY = env("LOG_QUEUE_POLICY", default="drop")
+LOG_QUEUE_TIMEOUT = env.float("LOG_QUEUE_TIMEOUT", default=0.1)
+
 # Error reporting
 IGNORABLE_404_URLS = [
     re.compile(r"^/apple-touch-icon.*\.png$"),
@@ -242,6 +330,8 @@ LOGGING = {
                 "%(process)d %(thread)d %(message)s "
                 "%(client)s %(request_id)s %(path)s "
                 "%(user_id)s %(status_code)d %(response_time).3f "
+                "%(db_queries)d %(db_time).3f %(db_connect_time).3f "
+                "%(cache_hits)d %(cache_misses)d "
             ),
         },
         "simple": {
@@ -326,6 +416,31 @@ LOGGING = {
     },
 }
 
+if LOG_QUEUE:
+    for name in ("file", "security_file", "error_file", "info_file"):
+        writer = LOGGING["handlers"].pop(name)
+        forwarder = {
+            "class": "apps.core.logqueue.QueueForwardHandler",
+            "queue": {
+                "()": "apps.core.logqueue.get_log_queue",
+                "maxsize": LOG_QUEUE_SIZE,
+            },
+            "listener": "apps.core.logqueue.get_log_listener",
+            "handlers": [f"{name}_writer"],
+            "target": f"{name}_writer",
+            "policy": LOG_QUEUE_POLICY,
+            "timeout": LOG_QUEUE_TIMEOUT,
+            # Filters read the request context, so they run before queueing.
+            "filters": writer.pop("filters"),
+        }
+        if "level" in writer:
+            forwarder["level"] = writer.pop("level")
+        # Rotated externally, see apps.core.logqueue.
+        writer["class"] = "logging.handlers.WatchedFileHandler"
+        del writer["maxBytes"], writer["backupCount"]
+        LOGGING["handlers"][name] = forwarder
+        LOGGING["handlers"][f"{name}_writer"] = writer
+
 if not DEBUG:
     sentry_sdk.init(
         dsn=env("SENTRY_DSN"),
@@ -364,7 +479,8 @@ ADMIN_MEDIA_PREFIX = STATIC_URL + "admin/"
 if DEBUG:
     import socket
 
-    INSTALLED_APPS += ["debug_toolbar"]
+    # Development tools, kept out of production startup.
+    INSTALLED_APPS += ["debug_toolbar", "django_extensions"]
     INTERNAL_IPS = ["127.0.0.1"]
 
     hostname, _, ips = socket.gethostbyname_ex(socket.gethostname())
@@ -2,7 +2,6 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 urlpatterns = [
     path("admin-panel/", admin.site.urls, name="admin"),
@@ -11,15 +10,23 @@ urlpatterns = [
     path("finance/", include("apps.finance.urls")),
 ]
 
-if settings.DEBUG:
-    import debug_toolbar
+if settings.API_SCHEMA:
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    from apps.core.schema_views import CachedSchemaView
 
     urlpatterns += [
-        path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+        path("api/schema/", CachedSchemaView.as_view(), name="schema"),
         path(
             "api/schema/swagger-ui/",
             SpectacularSwaggerView.as_view(url_name="schema"),
             name="swagger-ui",
         ),
+    ]
+
+if settings.DEBUG:
+    import debug_toolbar
+
+    urlpatterns += [
         path("__debug__/", include(debug_toolbar.urls)),
     ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,20 @@
+from subprocess import check_call
+
+GUNICORN_CONFIG = "conf/gunicorn.conf.py"
+
+
+def run_server():
+    check_call(["gunicorn", "--config", GUNICORN_CONFIG, "conf.wsgi:application"])
+
+
+def run_asgi_server():
+    check_call(
+        [
+            "gunicorn",
+            "--config",
+            GUNICORN_CONFIG,
+            "--worker-class",
+            "uvicorn_worker.UvicornWorker",
+            "conf.asgi:application",
+        ]
+    )